@@ -0,0 +1,158 @@
+# memory and traversal benchmark for action trees of large generated programs
+# compares the original dict backed node classes, the slotted node classes and the flat arena
+# usage: python -m bench.action_tree_bench [STATEMENTS...]
+import gc
+import sys
+import time
+import tracemalloc
+
+from syc.icg.action_tree import ExprNode, StatementNode, Literal, Identifier
+from syc.icg.arena import to_arena, from_arena, EXPR
+
+# default number of statements in the generated trees
+SIZES = [10000, 100000]
+
+
+# the original dict backed node classes
+class DictExprNode:
+    def __init__(self, func, rt_type, *args):
+        self.name = func
+        self.arguments = [*args]
+        self.data_type = rt_type
+
+
+class DictStatementNode:
+    def __init__(self, stmt, *args):
+        self.statement = stmt
+        self.arguments = [*args]
+
+
+class DictLiteral:
+    def __init__(self, data_type, val):
+        self.data_type = data_type
+        self.value = val
+
+
+class DictIdentifier:
+    def __init__(self, name, data_type, constant, constexpr=False):
+        self.name = name
+        self.data_type = data_type
+        self.constant = constant
+        self.constexpr = constexpr
+
+
+# stand in data types (the types are shared between nodes either way)
+class BenchType:
+    pass
+
+
+INT, BOOL = BenchType(), BenchType()
+
+
+# generate an action tree with count statements made from the given node classes
+def generate_tree(count, expr_node, statement_node, literal, identifier):
+    tree = []
+    for i in range(count):
+        x = identifier('x%d' % (i % 100), INT, False)
+        # x * 2 + -(y - 1) > 10
+        arithmetic = expr_node('+', INT, expr_node('*', INT, x, literal(INT, '2')),
+                               expr_node('ChangeSine', INT, expr_node('-', INT, identifier('y', INT, False), literal(INT, '1'))))
+        tree.append(statement_node('If', expr_node('>', BOOL, arithmetic, literal(INT, '10')),
+                                   [statement_node('Return', expr_node('Call', INT, identifier('f', INT, True), [x]))]))
+    return tree
+
+
+# compare two action trees node by node
+def same_tree(a, b):
+    pairs = [(a, b)]
+    while pairs:
+        a, b = pairs.pop()
+        if type(a) != type(b):
+            return False
+        if isinstance(a, list):
+            if len(a) != len(b):
+                return False
+            pairs.extend(zip(a, b))
+        elif isinstance(a, ExprNode):
+            if a.name != b.name or a.data_type is not b.data_type:
+                return False
+            pairs.append((a.arguments, b.arguments))
+        elif isinstance(a, StatementNode):
+            if a.statement != b.statement:
+                return False
+            pairs.append((a.arguments, b.arguments))
+        elif isinstance(a, Literal):
+            if a.value != b.value or a.data_type is not b.data_type:
+                return False
+        elif isinstance(a, Identifier):
+            if (a.name, a.constant, a.constexpr, a.value) != (b.name, b.constant, b.constexpr, b.value) or a.data_type is not b.data_type:
+                return False
+        elif a != b:
+            return False
+    return True
+
+
+# count the nodes with a given name by walking an object tree
+def count_object_nodes(tree, name):
+    count = 0
+    nodes = [tree]
+    while nodes:
+        node = nodes.pop()
+        if isinstance(node, list):
+            nodes.extend(node)
+        elif hasattr(node, 'arguments'):
+            if getattr(node, 'name', None) == name:
+                count += 1
+            nodes.extend(node.arguments)
+    return count
+
+
+# count the nodes with a given name by scanning an arena
+def count_arena_nodes(arena, name):
+    if name not in arena.string_ndx:
+        return 0
+    ndx = arena.string_ndx[name]
+    return sum(1 for kind, node_name in zip(arena.kinds, arena.names) if kind == EXPR and node_name == ndx)
+
+
+# measure the retained memory of building a representation (tree or arena)
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, retained
+
+
+# time a function (best of three)
+def best_time(func, *args):
+    best = None
+    for _ in range(3):
+        start = time.perf_counter()
+        result = func(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def run(sizes):
+    print('%10s %8s %14s %14s %10s' % ('statements', 'format', 'retained (MB)', 'traverse (s)', '+ nodes'))
+    for size in sizes:
+        dict_tree, dict_memory = measure(lambda: generate_tree(size, DictExprNode, DictStatementNode, DictLiteral, DictIdentifier))
+        dict_time, dict_count = best_time(count_object_nodes, dict_tree, '+')
+        del dict_tree
+        slot_tree, slot_memory = measure(lambda: generate_tree(size, ExprNode, StatementNode, Literal, Identifier))
+        slot_time, slot_count = best_time(count_object_nodes, slot_tree, '+')
+        # the arena is measured on its own (the tree it is converted from is freed)
+        arena, arena_memory = measure(lambda: to_arena(generate_tree(size, ExprNode, StatementNode, Literal, Identifier)))
+        arena_time, arena_count = best_time(count_arena_nodes, arena, '+')
+        if not dict_count == slot_count == arena_count or not same_tree(from_arena(arena), slot_tree):
+            print('action trees of %d statements do not match' % size)
+            sys.exit(1)
+        for label, memory, elapsed in [('dict', dict_memory, dict_time), ('slots', slot_memory, slot_time), ('arena', arena_memory, arena_time)]:
+            print('%10d %8s %14.1f %14.3f %10d' % (size, label, memory / 2 ** 20, elapsed, arena_count))
+
+
+if __name__ == '__main__':
+    run([int(x) for x in sys.argv[1:]] or SIZES)
@@ -0,0 +1,52 @@
+# benchmark for import resolution on a generated project with many packages
+# usage: python -m bench.import_bench [PACKAGES] [LINES]
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import build
+import util
+from bench.synthetic import write_include_graph
+
+# default number of packages in the project
+PACKAGES = 100
+
+# default number of lines in each package
+LINES = 500
+
+
+def run(packages, lines):
+    directory = tempfile.mkdtemp()
+    cache_dir = util.CACHE_DIR
+    try:
+        write_include_graph(directory, packages, lines)
+        with open(directory + '/main.sy') as file:
+            code = file.read()
+        job_counts = sorted({1, 2, 4, os.cpu_count() or 1})
+        print('%d packages of %d lines (%d cores)' % (packages, lines, os.cpu_count() or 1))
+        print('%6s %10s %8s' % ('jobs', 'time (s)', 'speedup'))
+        serial_time = None
+        for count in job_counts:
+            # start with an empty AST cache and no loaded packages
+            util.CACHE_DIR = tempfile.mkdtemp(dir=directory)
+            build.imports = {}
+            build.jobs = count
+            start = time.perf_counter()
+            # only the include graph is discovered and parsed (packages are not generated)
+            main = build.Unit((directory, code), directory + '/main.sy')
+            main.ast = build.parse_sources([code])[0]
+            build.discover(main)
+            elapsed = time.perf_counter() - start
+            serial_time = serial_time or elapsed
+            print('%6d %10.2f %7.1fx' % (count, elapsed, serial_time / elapsed))
+    finally:
+        util.CACHE_DIR = cache_dir
+        build.imports = {}
+        build.jobs = os.cpu_count() or 1
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else PACKAGES, int(sys.argv[2]) if len(sys.argv) > 2 else LINES)
@@ -0,0 +1,44 @@
+# runs a script with the time of its imports recorded (works on every python version, unlike -X importtime)
+# only imports made outside of other imports are timed (their time includes the imports they make)
+# each is written to stderr once the script exits as 'import time: MICROSECONDS | MODULE'
+# usage: python bench/import_timer.py SCRIPT [ARGS...]
+import builtins
+import os
+import runpy
+import sys
+import time
+
+# number of timed imports currently running
+depth = 0
+
+# (time in microseconds, module name) of every timed import
+imports = []
+
+original_import = builtins.__import__
+
+
+def timed_import(name, *args, **kwargs):
+    global depth
+    # modules that are already loaded take no time to import
+    if depth or name in sys.modules:
+        return original_import(name, *args, **kwargs)
+    depth += 1
+    start = time.perf_counter()
+    try:
+        return original_import(name, *args, **kwargs)
+    finally:
+        depth -= 1
+        imports.append(((time.perf_counter() - start) * 1e6, name))
+
+
+if __name__ == '__main__':
+    sys.argv = sys.argv[1:]
+    # the script imports from its own directory (not from this one)
+    sys.path[0] = os.path.dirname(os.path.abspath(sys.argv[0]))
+    builtins.__import__ = timed_import
+    try:
+        runpy.run_path(sys.argv[0], run_name='__main__')
+    finally:
+        builtins.__import__ = original_import
+        for elapsed, module in imports:
+            sys.stderr.write('import time: %d | %s\n' % (elapsed, module))
@@ -0,0 +1,28 @@
+# check that the members of an included package (one without use) can be read in a real build
+# builds tests/include_test.sy, which reads an export of tests/member_lib.sy and a name it does not export
+# usage: python -m bench.include_check
+import subprocess
+import sys
+
+import util
+
+# directory the program is built from (includes are resolved relative to it)
+DIRECTORY = util.SOURCE_DIR + '/tests'
+
+# output the build has to hold (the member read and the error for the missing member)
+EXPECTED = ['DeclareVariable {None, a, (GetMember', 'Package has no member \'y\'']
+
+
+def run():
+    result = subprocess.run([sys.executable, util.SOURCE_DIR + '/syclone.py', 'build', 'include_test.sy'], cwd=DIRECTORY,
+                            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True)
+    missing = [x for x in EXPECTED if x not in result.stdout]
+    if result.returncode or missing:
+        print(result.stdout)
+        print('Build of include_test.sy failed' if result.returncode else 'Missing from output: %s' % ', '.join(missing))
+        sys.exit(1)
+    print('Members of included packages resolved')
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,64 @@
+# benchmark for the single pass lexer against the original per token type lexer
+# usage: python -m bench.lexer_bench [--legacy-max LINES] [SIZES...]
+import re
+import sys
+import time
+
+from syc.ast.ast import Token
+from syc.ast.lexer import Lexer
+from bench.synthetic import generate_program
+
+# default program sizes (in lines)
+SIZES = [10000, 100000, 1000000]
+
+# largest program the original lexer is run on (it is quadratic)
+LEGACY_MAX = 10000
+
+
+# the original lexer (one finditer and re.sub per token type), kept as a reference
+def legacy_lex(lx, code):
+    phrases = {}
+    code = lx.clear_comments(code)
+    for token in lx.tokenTypes:
+        matches = re.finditer(re.compile(lx.tokenTypes[token]), code)
+        for match in matches:
+            if match.group(0) != "" and match.start() not in phrases.keys():
+                phrases[match.start()] = Token(token, match.group(0), match.start())
+                code = re.sub(lx.tokenTypes[token], " " * len(match.group(0)), code, 1)
+    numbers = [x for x in phrases]
+    numbers.sort()
+    return [phrases[x] for x in numbers]
+
+
+# time a single call
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def run(sizes, legacy_max):
+    lx = Lexer()
+    print('%10s %10s %12s %12s %10s' % ('lines', 'tokens', 'single (s)', 'legacy (s)', 'speedup'))
+    for size in sizes:
+        code = generate_program(size)
+        tokens, single_time = timed(lx.lex, code)
+        if size <= legacy_max:
+            legacy_tokens, legacy_time = timed(legacy_lex, lx, code)
+            # ensure both lexers produce the same token stream
+            if [(x.type, x.value, x.ndx) for x in tokens] != [(x.type, x.value, x.ndx) for x in legacy_tokens]:
+                print('token streams differ for %d lines' % size)
+                sys.exit(1)
+            print('%10d %10d %12.3f %12.3f %9.1fx' % (size, len(tokens), single_time, legacy_time, legacy_time / single_time))
+        else:
+            print('%10d %10d %12.3f %12s %10s' % (size, len(tokens), single_time, '-', '-'))
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    legacy_limit = LEGACY_MAX
+    if '--legacy-max' in args:
+        ndx = args.index('--legacy-max')
+        legacy_limit = int(args[ndx + 1])
+        del args[ndx:ndx + 2]
+    run([int(x) for x in args] or SIZES, legacy_limit)
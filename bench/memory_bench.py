@@ -0,0 +1,80 @@
+# memory benchmark for lexing and parsing large generated programs
+# compares the slotted Token and ASTNode classes with the original dict backed classes
+# usage: python -m bench.memory_bench [SIZES...]
+import gc
+import sys
+import tracemalloc
+
+import syc.ast.ast as ast
+import syc.ast.lexer as lexer
+import syc.ast.parser as parser
+from bench.synthetic import generate_program
+
+# default program sizes (in lines)
+SIZES = [10000, 50000]
+
+
+# the original dict backed token class
+class DictToken:
+    def __init__(self, type, value, ndx, source=None):
+        self.type = type
+        self.value = value
+        self.ndx = ndx
+        self.source = source
+
+
+# the original dict backed AST node class
+class DictASTNode:
+    def __init__(self, name):
+        self.name = name
+        self.content = []
+
+
+# swap the node classes used by the lexer and parser
+def use_classes(token_class, node_class):
+    lexer.Token = token_class
+    parser.Token = token_class
+    parser.ASTNode = node_class
+
+
+# count the tokens and AST nodes in a tree
+def count_objects(tree, node_class):
+    count = 0
+    nodes = [tree]
+    while nodes:
+        node = nodes.pop()
+        count += 1
+        if isinstance(node, node_class):
+            nodes.extend(node.content)
+    return count
+
+
+# measure the peak and retained memory of lexing and parsing code
+# streamed tokens are parsed as they are lexed instead of being lexed to a list first
+def measure(code, node_class, stream=False):
+    gc.collect()
+    tracemalloc.start()
+    lx = lexer.Lexer()
+    tree = parser.Parser(lx.tokens(code) if stream else lx.lex(code)).parse()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak, retained, count_objects(tree, node_class)
+
+
+def run(sizes):
+    # load the shared parse table first so it is not counted
+    parser.get_compiled_table()
+    print('%8s %8s %12s %14s %14s %12s' % ('lines', 'classes', 'objects/kloc', 'peak (MB)', 'retained (MB)', 'bytes/object'))
+    for size in sizes:
+        code = generate_program(size)
+        kloc = code.count('\n') / 1000
+        for label, token_class, node_class, stream in [('dict', DictToken, DictASTNode, False), ('slots', ast.Token, ast.ASTNode, False),
+                                                       ('stream', ast.Token, ast.ASTNode, True)]:
+            use_classes(token_class, node_class)
+            peak, retained, objects = measure(code, node_class, stream)
+            print('%8d %8s %12.0f %14.1f %14.1f %12.0f' % (size, label, objects / kloc, peak / 2 ** 20, retained / 2 ** 20, retained / objects))
+    use_classes(ast.Token, ast.ASTNode)
+
+
+if __name__ == '__main__':
+    run([int(x) for x in sys.argv[1:]] or SIZES)
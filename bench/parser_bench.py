@@ -0,0 +1,76 @@
+# benchmark for the compiled (integer coded) parser against the string keyed parser
+# usage: python -m bench.parser_bench [SCALE]
+import contextlib
+import glob
+import io
+import sys
+import time
+
+import util
+from syc.ast.ast import ASTNode
+from syc.ast.lexer import Lexer
+from syc.ast.parser import Parser, get_parse_table, get_compiled_table
+
+# default number of times each corpus file is repeated
+SCALE = 200
+
+
+# get all of the files in tests/ that parse (the rest are for unfinished features)
+def load_corpus():
+    corpus = []
+    lx = Lexer()
+    table, grammar = get_parse_table()
+    for path in sorted(glob.glob(util.SOURCE_DIR + '/tests/**/*.sy', recursive=True)):
+        with open(path) as file:
+            code = file.read()
+        try:
+            # syntax errors print and exit
+            with contextlib.redirect_stdout(io.StringIO()):
+                Parser(lx.lex(code)).run_parser(table, grammar)
+        except SystemExit:
+            continue
+        corpus.append((path, code))
+    return corpus
+
+
+# compare two ASTs without recursion (ASTs of scaled files are too deep for str)
+def same_ast(a, b):
+    pairs = [(a, b)]
+    while pairs:
+        a, b = pairs.pop()
+        if isinstance(a, ASTNode):
+            if not isinstance(b, ASTNode) or a.name != b.name or len(a.content) != len(b.content):
+                return False
+            pairs.extend(zip(a.content, b.content))
+        elif a is not b:
+            return False
+    return True
+
+
+# time a parser over a token list (the parser appends to its input, so a copy is used)
+def timed(tokens, parse):
+    parser = Parser(list(tokens))
+    start = time.perf_counter()
+    ast = parse(parser)
+    return ast, time.perf_counter() - start
+
+
+def run(scale):
+    lx = Lexer()
+    table, grammar = get_parse_table()
+    compiled = get_compiled_table()
+    print('%-28s %10s %14s %14s %8s' % ('file', 'tokens', 'string tok/s', 'compiled tok/s', 'speedup'))
+    for path, code in load_corpus():
+        tokens = lx.lex('\n'.join([code] * scale))
+        string_ast, string_time = timed(tokens, lambda x: x.run_parser(table, grammar))
+        compiled_ast, compiled_time = timed(tokens, lambda x: x.run_compiled_parser(compiled))
+        # both modes must build the same AST
+        if not same_ast(string_ast, compiled_ast):
+            print('ASTs differ for %s' % path)
+            sys.exit(1)
+        print('%-28s %10d %14.0f %14.0f %7.1fx' % (path[len(util.SOURCE_DIR) + 1:], len(tokens), len(tokens) / string_time,
+                                                  len(tokens) / compiled_time, string_time / compiled_time))
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else SCALE)
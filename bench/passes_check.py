@@ -0,0 +1,43 @@
+# check that the optimization passes rewrite the action tree of a real build
+# builds tests/passes_test.sy at every optimization level (with --verify-passes) and reads the node counts from --stats
+# usage: python -m bench.passes_check
+import re
+import subprocess
+import sys
+
+import util
+
+# program built by the check (holds constant expressions, double negations, nested arithmetic and variables in literals)
+PROGRAM = util.SOURCE_DIR + '/tests/passes_test.sy'
+
+# --stats line of a pass (name, nodes before, nodes after)
+PASS_LINE = re.compile(r'Pass (\w+): [\d.]+ ms, (\d+) -> (\d+) nodes')
+
+
+# build the program at an optimization level, returns (pass name, nodes before, nodes after) of every pass run
+def run_level(level):
+    result = subprocess.run([sys.executable, util.SOURCE_DIR + '/syclone.py', 'build', PROGRAM, '--O%d' % level, '--stats', '--verify-passes'],
+                            cwd=util.SOURCE_DIR, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True)
+    if result.returncode:
+        print(result.stdout)
+        raise util.SyCloneRecoverableError('Build at --O%d failed.' % level)
+    return [(x.group(1), int(x.group(2)), int(x.group(3))) for x in PASS_LINE.finditer(result.stdout)]
+
+
+def run():
+    failed = []
+    for level in range(4):
+        passes = run_level(level)
+        for name, before, after in passes:
+            print('--O%d %-24s %6d -> %6d nodes' % (level, name, before, after))
+        # every level but --O0 runs passes and the program gives each level something to rewrite
+        if level and (not passes or all(before == after for name, before, after in passes)):
+            failed.append('--O%d' % level)
+    if failed:
+        print('No nodes rewritten at: %s' % ', '.join(failed))
+        sys.exit(1)
+    print('Passes rewrote nodes at every optimization level')
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,87 @@
+# startup benchmark for the syclone cli
+# runs short commands in fresh interpreters (timing their imports with import_timer.py) and checks them against the budget in startup_budget.json
+# usage: python -m bench.startup_bench [RUNS] [--update]
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import util
+
+# tracked startup budget (milliseconds of wall time and import time per command)
+BUDGET_PATH = os.path.dirname(os.path.realpath(__file__)) + '/startup_budget.json'
+
+# default number of runs per command (the fastest run is used)
+RUNS = 5
+
+# headroom given to measured times when the budget is updated
+HEADROOM = 2
+
+# runs a script with its imports timed (-X importtime is not available before python 3.7)
+IMPORT_TIMER = os.path.dirname(os.path.realpath(__file__)) + '/import_timer.py'
+
+# import_timer.py line (time in microseconds and module name)
+IMPORT_LINE = re.compile(r'import time: (\d+) \| (\S+)')
+
+
+# commands measured (name, arguments of syclone.py)
+def get_commands(directory):
+    return [
+        ('version', ['version']),
+        ('build_empty', ['build', directory + '/empty.sy'])
+    ]
+
+
+# run a command in a fresh interpreter, returns the wall time and the import time (seconds) and the top imports
+def run_command(args, directory):
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, IMPORT_TIMER, util.SOURCE_DIR + '/syclone.py'] + args, cwd=directory,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, universal_newlines=True)
+    elapsed = time.perf_counter() - start
+    if result.returncode:
+        print(result.stderr)
+        raise util.SyCloneRecoverableError('Command \'%s\' failed.' % ' '.join(args))
+    # only imports made outside of other imports are reported (their time includes their imports)
+    imports = [(int(x.group(1)) / 1e6, x.group(2)) for x in IMPORT_LINE.finditer(result.stderr)]
+    return elapsed, sum(x[0] for x in imports), sorted(imports, reverse=True)[:5]
+
+
+def run(runs, update):
+    directory = tempfile.mkdtemp()
+    try:
+        open(directory + '/empty.sy', 'w').close()
+        with open(BUDGET_PATH) as file:
+            budget = json.load(file)
+        results = {}
+        over = []
+        print('%12s %10s %12s %10s' % ('command', 'wall (ms)', 'import (ms)', 'budget (wall/import)'))
+        for name, args in get_commands(directory):
+            measured = [run_command(args, directory) for _ in range(runs)]
+            elapsed, import_time, imports = min(measured)
+            results[name] = {'wall_ms': elapsed * 1000, 'import_ms': import_time * 1000}
+            limits = budget.get(name, {})
+            print('%12s %10.1f %12.1f %10s' % (name, elapsed * 1000, import_time * 1000,
+                                               '/'.join('%d' % limits[x] for x in sorted(limits, reverse=True)) or '-'))
+            for module_time, module in imports:
+                print('%12s %10s %12.1f %s' % ('', '', module_time * 1000, module))
+            if any(results[name][x] > limits[x] for x in limits):
+                over.append(name)
+        if update:
+            with open(BUDGET_PATH, 'w') as file:
+                json.dump({x: {y: round(results[x][y] * HEADROOM) for y in results[x]} for x in results}, file, indent=2)
+                file.write('\n')
+            print('Budget updated')
+        elif over:
+            print('Over budget: %s' % ', '.join(over))
+            sys.exit(1)
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    arguments = [x for x in sys.argv[1:] if x != '--update']
+    run(int(arguments[0]) if arguments else RUNS, '--update' in sys.argv[1:])
@@ -0,0 +1,255 @@
+# benchmark suite run by syclone bench
+# times every phase of the compiler (lexer, parser, import resolution, symbol table and icg) on synthetic programs
+# results are stored as json and compared against a saved baseline
+# usage: syclone bench [--quick] [--repeat N] [--output PATH] [--baseline PATH] [--save-baseline] [--threshold PERCENT]
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+import util
+from bench.synthetic import SHAPES, write_include_graph
+
+# sizes of each single file shape (full run, quick run)
+SHAPE_SIZES = {
+    'functions': ([1000, 10000], [1000]),
+    'deep_expression': ([25, 100], [25]),
+    'declarations': ([1000, 10000], [1000]),
+    'array_literal': ([1000, 20000], [1000]),
+    'nested_scopes': ([25, 100], [25])
+}
+
+# sizes of each shape given to the icg (its generators recurse over statement lists, so its inputs are smaller)
+ICG_SIZES = {
+    'functions': ([100, 1000], [100]),
+    'deep_expression': ([25, 50], [25]),
+    'declarations': ([100, 500], [100]),
+    'array_literal': ([100, 500], [100]),
+    'nested_scopes': ([25, 100], [25])
+}
+
+# packages in the generated include graphs (full run, quick run)
+INCLUDE_SIZES = ([20, 100], [20])
+
+# lines in each package of the include graphs
+INCLUDE_LINES = 200
+
+# symbols declared in each scope of the symbol table benchmark (full run, quick run)
+TABLE_SIZES = ([1000, 10000], [1000])
+
+# nested scopes in the symbol table benchmark
+TABLE_DEPTH = 50
+
+# default number of times each benchmark is run (the fastest run is used)
+REPEAT = 3
+
+# default slow down (percent) over the baseline reported as a regression
+THRESHOLD = 20
+
+# smallest slow down (seconds) reported as a regression (shorter benchmarks are mostly noise)
+MIN_DELTA = 0.001
+
+# default location of results and the baseline
+RESULTS_PATH = util.CACHE_DIR + '/bench/results.json'
+BASELINE_PATH = util.CACHE_DIR + '/bench/baseline.json'
+
+
+# time a function (best of repeat runs), setup is called before every run and its result is passed to func
+def best_time(repeat, func, setup=None):
+    best = None
+    for _ in range(repeat):
+        args = setup() if setup else ()
+        start = time.perf_counter()
+        func(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+#############
+# HARNESSES #
+#############
+
+# all harnesses take the number of runs and the size of their input and return the best time in seconds
+
+
+def bench_lexer(repeat, shape, size):
+    from syc.ast.lexer import Lexer
+    code = SHAPES[shape](size)
+    lx = Lexer()
+    return best_time(repeat, lx.lex, lambda: (code,))
+
+
+def bench_parser(repeat, shape, size):
+    from syc.ast.lexer import Lexer
+    from syc.ast.parser import Parser, get_compiled_table
+    tokens = Lexer().lex(SHAPES[shape](size))
+    # the parse table is not part of the timing
+    get_compiled_table()
+    # a parser consumes its input, so every run gets a new one
+    return best_time(repeat, lambda x: x.parse(), lambda: (Parser(tokens),))
+
+
+def bench_icg(repeat, shape, size):
+    from syc.ast.lexer import Lexer
+    from syc.ast.parser import Parser
+    import syc.icg.generate as generate
+    code = SHAPES[shape](size)
+
+    def setup():
+        # each run generates a fresh ast in an empty symbol table
+        util.symbol_table = None
+        return Parser(Lexer().lex(code)).parse(),
+
+    # the generator prints its output
+    with contextlib.redirect_stdout(io.StringIO()):
+        return best_time(repeat, generate.generate_tree, setup)
+
+
+def bench_imports(repeat, packages):
+    import build
+    directory = tempfile.mkdtemp()
+    cache_dir = util.CACHE_DIR
+    try:
+        with open(write_include_graph(directory, packages, INCLUDE_LINES)) as file:
+            code = file.read()
+
+        def setup():
+            # start with an empty AST cache and no loaded packages
+            util.CACHE_DIR = tempfile.mkdtemp(dir=directory)
+            build.imports = {}
+            main = build.Unit((directory, code), directory + '/main.sy')
+            main.ast = build.parse_sources([code])[0]
+            return main,
+
+        return best_time(repeat, build.discover, setup)
+    finally:
+        util.CACHE_DIR = cache_dir
+        build.imports = {}
+        shutil.rmtree(directory)
+
+
+def bench_symbol_table(repeat, size):
+    from syc.icg.table import SymbolTable, Symbol, Modifiers
+
+    # declare size symbols in every scope of a nested table, then look each of them up from the innermost scope
+    def run():
+        table = SymbolTable()
+        for depth in range(TABLE_DEPTH):
+            table.add_scope()
+            for i in range(size // TABLE_DEPTH):
+                table.add_variable(Symbol('s%d_%d' % (depth, i), None, [Modifiers.EXTERNAL]), None)
+        for depth in range(TABLE_DEPTH):
+            for i in range(size // TABLE_DEPTH):
+                table.look_up('s%d_%d' % (depth, i))
+
+    return best_time(repeat, run)
+
+
+# get every benchmark of the suite (name, size, function returning the best time)
+def get_benchmarks(quick, repeat):
+    choice = 1 if quick else 0
+    benchmarks = []
+    for phase, harness, sizes in [('lexer', bench_lexer, SHAPE_SIZES), ('parser', bench_parser, SHAPE_SIZES), ('icg', bench_icg, ICG_SIZES)]:
+        for shape in SHAPES:
+            for size in sizes[shape][choice]:
+                benchmarks.append(('%s/%s/%d' % (phase, shape, size), size,
+                                   lambda harness=harness, shape=shape, size=size: harness(repeat, shape, size)))
+    for size in INCLUDE_SIZES[choice]:
+        benchmarks.append(('imports/include_graph/%d' % size, size, lambda size=size: bench_imports(repeat, size)))
+    for size in TABLE_SIZES[choice]:
+        benchmarks.append(('symbol_table/nested/%d' % size, size, lambda size=size: bench_symbol_table(repeat, size)))
+    return benchmarks
+
+
+# run the suite (returns the results by benchmark name)
+def run_suite(quick, repeat):
+    results = {}
+    for name, size, benchmark in get_benchmarks(quick, repeat):
+        try:
+            results[name] = {'size': size, 'seconds': benchmark()}
+        # a failing benchmark is reported without stopping the suite
+        except (Exception, SystemExit) as e:
+            results[name] = {'size': size, 'error': '%s: %s' % (type(e).__name__, e)}
+        print('%-40s %s' % (name, '%.4f s' % results[name]['seconds'] if 'seconds' in results[name] else results[name]['error']))
+    return results
+
+
+# compare results to a baseline (returns the names of the benchmarks that slowed down by more than threshold percent)
+# benchmarks that fail but have a baseline time are regressions as well
+def find_regressions(results, baseline, threshold):
+    regressions = []
+    for name in results:
+        if 'seconds' in baseline.get(name, {}):
+            if 'error' in results[name]:
+                regressions.append(name)
+                continue
+            seconds, base = results[name]['seconds'], baseline[name]['seconds']
+            if seconds > base * (1 + threshold / 100) and seconds - base > MIN_DELTA:
+                regressions.append(name)
+    return regressions
+
+
+def write_json(path, data):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w') as file:
+        json.dump(data, file, indent=2, sort_keys=True)
+        file.write('\n')
+
+
+# get the value of an option (--option VALUE) from a list of arguments
+def get_option(args, option, default):
+    if option in args:
+        ndx = args.index(option)
+        if ndx + 1 >= len(args):
+            raise util.SyCloneRecoverableError('No value specified for \'%s\'.' % option)
+        value = args[ndx + 1]
+        del args[ndx:ndx + 2]
+        return value
+    return default
+
+
+# syclone bench
+def bench(args):
+    args = list(args)
+    output = get_option(args, '--output', RESULTS_PATH)
+    baseline_path = get_option(args, '--baseline', BASELINE_PATH)
+    threshold = float(get_option(args, '--threshold', THRESHOLD))
+    repeat = int(get_option(args, '--repeat', REPEAT))
+    flags = {'--quick', '--save-baseline'}
+    if any(x not in flags for x in args):
+        raise util.SyCloneRecoverableError('Unknown arguments: %s' % ' '.join(x for x in args if x not in flags))
+    results = run_suite('--quick' in args, repeat)
+    write_json(output, {
+        'version': util.VERSION,
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'results': results
+    })
+    print('Results written to %s' % output)
+    if '--save-baseline' in args:
+        os.makedirs(os.path.dirname(os.path.abspath(baseline_path)), exist_ok=True)
+        shutil.copyfile(output, baseline_path)
+        print('Baseline saved to %s' % baseline_path)
+        return
+    if not os.path.exists(baseline_path):
+        print('No baseline to compare to (save one with --save-baseline)')
+        return
+    with open(baseline_path) as file:
+        baseline = json.load(file)['results']
+    regressions = find_regressions(results, baseline, threshold)
+    for name in regressions:
+        if 'error' in results[name]:
+            print('Regression: %s %.4f s -> %s' % (name, baseline[name]['seconds'], results[name]['error']))
+        else:
+            print('Regression: %s %.4f s -> %.4f s (+%.1f%%)' % (name, baseline[name]['seconds'], results[name]['seconds'],
+                                                               (results[name]['seconds'] / baseline[name]['seconds'] - 1) * 100))
+    if regressions:
+        sys.exit(1)
+    print('No regressions over %.0f%% against %s' % (threshold, baseline_path))
@@ -0,0 +1,156 @@
+# benchmark for symbol table declarations, look ups and deletes in deeply nested scopes
+# usage: python -m bench.symbol_table_bench [DEPTH] [SYMBOLS] [DECLARATIONS]
+import sys
+import time
+
+import errormodule
+from syc.icg.table import SymbolTable, Symbol, Modifiers, Package
+
+# default number of nested scopes
+DEPTH = 100
+
+# default number of symbols declared in each scope
+SYMBOLS = 50
+
+# default number of declarations made in the innermost scope by the declaration benchmark
+DECLARATIONS = 5000
+
+
+# the original nested list symbol table (only the parts being benchmarked), kept as a reference
+class LegacySymbolTable:
+    def __init__(self):
+        self.table = []
+        self.scope_path = []
+        self.scope = []
+        self.pos = 0
+
+    def update_scope(self, tb, scope_pos=0):
+        if scope_pos < len(self.scope_path):
+            tb[self.scope_path[scope_pos]] = self.update_scope(tb[self.scope_path[scope_pos]], scope_pos + 1)
+            return tb
+        else:
+            return self.scope
+
+    def add_scope(self):
+        self.scope.append([])
+        self.table = self.update_scope(self.table)
+        self.scope = self.scope[self.pos]
+        self.scope_path.append(self.pos)
+        self.pos = 0
+
+    def exit_scope(self):
+        updated_scope = False
+
+        def update_table(tb, scope_pos=0):
+            if scope_pos < len(self.scope_path):
+                tb[self.scope_path[scope_pos]] = update_table(tb[self.scope_path[scope_pos]], scope_pos + 1)
+                nonlocal updated_scope
+                if not updated_scope:
+                    self.scope = tb
+                    updated_scope = True
+                return tb
+            else:
+                return self.scope
+
+        self.table = update_table(self.table)
+        self.scope_path.pop()
+
+    def add_variable(self, sym, ast):
+        if sym.name in [x.name for x in self.scope if isinstance(x, Symbol)]:
+            errormodule.throw('semantic_error', 'Variable \'%s\' redeclared.' % sym.name, ast)
+        self.scope.append(sym)
+        self.table = self.update_scope(self.table)
+        self.pos += 1
+
+    def delete(self, var):
+        deleted = False
+
+        def delete(layer):
+            nonlocal deleted
+            for i in range(len(layer)):
+                if isinstance(layer[i], list):
+                    layer[i] = delete(layer[i])
+            if not deleted:
+                for i in range(len(layer)):
+                    if isinstance(layer[i], Symbol) and layer[i].compare(var):
+                        layer[i].modifiers.append(Modifiers.DELETED)
+                        deleted = True
+                        return layer
+            return layer
+        self.table = delete(self.table)
+        return deleted
+
+    def look_up(self, var):
+        layers = list()
+        c_layer = self.table
+        for item in self.scope_path:
+            layers.append(c_layer)
+            c_layer = c_layer[item]
+        layers.append(self.scope)
+        for layer in reversed(layers):
+            for item in layer:
+                if isinstance(item, Symbol):
+                    if item.compare(var) and Modifiers.DELETED not in item.modifiers:
+                        return item
+                elif isinstance(item, Package):
+                    if item.name == var:
+                        return item
+
+
+# declare symbols in nested scopes, then look up and delete every visible symbol from the innermost scope
+def run_table(table, depth, symbols):
+    start = time.perf_counter()
+    for level in range(depth):
+        # symbols come before the next scope so the legacy table's scope positions stay valid
+        for i in range(symbols):
+            table.add_variable(Symbol('v%d_%d' % (level, i), None, []), None)
+        table.add_scope()
+    declare_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for level in range(depth):
+        for i in range(symbols):
+            if not table.look_up('v%d_%d' % (level, i)):
+                print('failed to find v%d_%d' % (level, i))
+                sys.exit(1)
+    look_up_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for level in range(depth):
+        for i in range(symbols):
+            if not table.delete('v%d_%d' % (level, i)):
+                print('failed to delete v%d_%d' % (level, i))
+                sys.exit(1)
+    delete_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(depth):
+        table.exit_scope()
+    exit_time = time.perf_counter() - start
+    return declare_time, look_up_time, delete_time, exit_time
+
+
+# declare symbols in the innermost of a set of nested scopes (the cost of a declaration should not depend on depth)
+def run_declarations(table, depth, declarations):
+    for _ in range(depth):
+        table.add_scope()
+    start = time.perf_counter()
+    for i in range(declarations):
+        table.add_variable(Symbol('d%d' % i, None, []), None)
+    return time.perf_counter() - start
+
+
+def run(depth, symbols, declarations):
+    print('%d nested scopes, %d symbols per scope' % (depth, symbols))
+    print('%8s %12s %12s %12s %12s' % ('table', 'declare (s)', 'look up (s)', 'delete (s)', 'exit (s)'))
+    for label, table in [('legacy', LegacySymbolTable()), ('current', SymbolTable())]:
+        print('%8s %12.3f %12.3f %12.3f %12.3f' % (label, *run_table(table, depth, symbols)))
+    print('\n%d declarations in the innermost scope' % declarations)
+    print('%8s %12s %12s' % ('depth', 'legacy (s)', 'current (s)'))
+    # the legacy table recurs once per scope, so depth is kept under the recursion limit
+    for scope_depth in [1, 10, 100, 500]:
+        legacy_time = run_declarations(LegacySymbolTable(), scope_depth, declarations)
+        current_time = run_declarations(SymbolTable(), scope_depth, declarations)
+        print('%8d %12.3f %12.3f' % (scope_depth, legacy_time, current_time))
+
+
+if __name__ == '__main__':
+    args = [int(x) for x in sys.argv[1:]]
+    run(*(args + [DEPTH, SYMBOLS, DECLARATIONS][len(args):]))
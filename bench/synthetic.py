@@ -0,0 +1,93 @@
+# generators for synthetic SyClone programs used by the benchmarks
+
+
+# template for a single function unit (every unit lexes and parses on its own)
+FUNCTION_UNIT = '''func f%(n)d($a: int, $b: int) int {
+    // unit %(n)d
+    $x%(n)d = a + b * %(n)d - (a %% 3);
+    $s = "value %(n)d";
+    $c = 'c';
+    $l: list[int] = [%(n)d, 2, 3];
+    $m: map[char, int] = {'a': %(n)d};
+    if (x%(n)d > 10 && b < 2) {
+        x%(n)d = x%(n)d / 2;
+    }
+    return x%(n)d;
+}
+
+'''
+
+
+# generate a program of (approximately) line_count lines
+def generate_program(line_count):
+    units = []
+    lines = 0
+    n = 0
+    while lines < line_count:
+        unit = FUNCTION_UNIT % {'n': n}
+        units.append(unit)
+        lines += unit.count('\n')
+        n += 1
+    return ''.join(units)
+
+
+# wrap statements in a function (statements are only generated inside of functions)
+def in_function(body):
+    return 'func f() int {\n%s}\n' % body
+
+
+# generate a single expression nested depth levels deep (((1 + 1) * 2) - 3 ...)
+def generate_deep_expression(depth):
+    operators = ['+', '*', '-']
+    expr = '1'
+    for i in range(depth):
+        expr = '(%s %s %d)' % (expr, operators[i % 3], i % 7 + 1)
+    return in_function('    $e = %s;\n' % expr)
+
+
+# generate count variable declarations
+def generate_declarations(count):
+    return in_function(''.join('    $v%d: int = %d;\n' % (i, i) for i in range(count)))
+
+
+# generate a list literal holding count elements
+def generate_array_literal(count):
+    return in_function('    $a: list[int] = [%s];\n' % ', '.join(str(i % 100) for i in range(count)))
+
+
+# generate a function with depth nested blocks (each declaring a variable)
+def generate_nested_scopes(depth):
+    lines = ['func f() int {', '    $a = %d;' % depth]
+    for i in range(depth):
+        lines.append('    ' * (i + 1) + 'if (a > %d) {' % i)
+        lines.append('    ' * (i + 2) + '$x%d = a + %d;' % (i, i))
+    for i in reversed(range(depth)):
+        lines.append('    ' * (i + 1) + '}')
+    lines.append('    return a;')
+    lines.append('}')
+    return '\n'.join(lines) + '\n'
+
+
+# single file program shapes by name (each takes the size of the program)
+SHAPES = {
+    'functions': generate_program,
+    'deep_expression': generate_deep_expression,
+    'declarations': generate_declarations,
+    'array_literal': generate_array_literal,
+    'nested_scopes': generate_nested_scopes
+}
+
+
+# write a wide include graph: the main file includes every package and every package includes a shared package
+# returns the path of the main file
+def write_include_graph(directory, packages, lines):
+    body = generate_program(lines)
+    with open(directory + '/main.sy', 'w') as file:
+        file.write(''.join('include pkg%d;\n' % i for i in range(packages)) + body)
+    for i in range(packages):
+        with open(directory + '/pkg%d.sy' % i, 'w') as file:
+            # vary the code so every package is cached separately
+            file.write('include common;\n' + body.replace('func f', 'func p%d_' % i))
+    with open(directory + '/common.sy', 'w') as file:
+        file.write(body)
+    return directory + '/main.sy'
@@ -0,0 +1,134 @@
+# benchmark for parse table generation on the current grammar
+# usage: python -m bench.table_bench [REPEAT]
+import sys
+import time
+
+import syc.ast.grammar as gramtools
+from syc.ast.parser import generate_table
+
+# default number of generations timed
+REPEAT = 20
+
+
+# the original recursive, list based table generator, kept as a reference
+class LegacyTableGenerator:
+    def __init__(self):
+        self.follow_table = {}
+
+    def generate_table(self, grammar):
+        parsing_table = {}
+        for production in grammar.productions:
+            parsing_table[production] = {}
+            for sub_pro in grammar.productions[production]:
+                first = self.first(grammar=grammar, production=[sub_pro])
+                for item in first:
+                    if item == "&":
+                        follow = self.follow(production, grammar)
+                        for f in follow:
+                            parsing_table[production][f] = sub_pro
+                    else:
+                        parsing_table[production][item] = sub_pro
+        return parsing_table
+
+    def follow(self, symbol, grammar):
+        if symbol in self.follow_table.keys():
+            return self.follow_table[symbol]
+        follow_set = []
+
+        def add_to_follow_set(char):
+            if char not in follow_set:
+                follow_set.append(char)
+
+        if symbol == grammar.start_symbol:
+            add_to_follow_set("$")
+        for name in grammar.productions:
+            production = grammar.productions[name]
+            for subPro in production:
+                if symbol in subPro:
+                    ndx = subPro.index(symbol)
+                    if ndx >= len(subPro) - 1 and symbol != name:
+                        for item in self.follow(name, grammar):
+                            add_to_follow_set(item)
+                    elif ndx < len(subPro) - 1:
+                        for item in self.evaluate_follow(grammar, subPro, ndx, name, symbol):
+                            add_to_follow_set(item)
+        self.follow_table[symbol] = follow_set
+        return follow_set
+
+    def evaluate_follow(self, grammar, subPro, ndx, name, symbol):
+        follow_set = []
+
+        def add_to_follow_set(char):
+            if char not in follow_set:
+                follow_set.append(char)
+
+        for follow in self.first(grammar, [subPro[ndx + 1:]]):
+            if follow != "&":
+                add_to_follow_set(follow)
+            elif ndx + 2 < len(subPro) - 1:
+                for follow2 in self.evaluate_follow(grammar, subPro[ndx + 2:], ndx, name, symbol):
+                    add_to_follow_set(follow2)
+            else:
+                for follow3 in self.follow(name, grammar):
+                    add_to_follow_set(follow3)
+        return follow_set
+
+    def first(self, grammar, production):
+        first_list = []
+
+        def add_to_first_list(obj):
+            for item in (obj if isinstance(obj, list) else [obj]):
+                if item not in first_list:
+                    first_list.append(item)
+
+        for sub_pro in production:
+            if sub_pro[0] in grammar.terminals or sub_pro[0] == "&":
+                add_to_first_list(sub_pro[0])
+            else:
+                add_to_first_list(self.non_terminal_first(grammar, sub_pro, 0))
+        return first_list
+
+    def non_terminal_first(self, grammar, production, pos):
+        firsts = []
+        for item in self.first(grammar, grammar.productions[production[pos]]):
+            if item != "&":
+                firsts.append(item)
+            elif len(production) - 1 >= pos + 1:
+                if production[pos + 1] in grammar.nonterminals:
+                    firsts += self.non_terminal_first(grammar, production, pos + 1)
+                else:
+                    firsts.append(production[pos + 1])
+            else:
+                firsts.append(item)
+        return firsts
+
+
+def run(repeat):
+    grammar = gramtools.build_grammar()
+    print('grammar: %d nonterminals, %d productions' % (len(grammar.productions), sum(len(x) for x in grammar.productions.values())))
+    # time the fixed point generator
+    start = time.perf_counter()
+    for _ in range(repeat):
+        table, conflicts = generate_table(grammar)
+    fixed_point_time = (time.perf_counter() - start) / repeat
+    # time the original generator
+    start = time.perf_counter()
+    for _ in range(repeat):
+        legacy_table = LegacyTableGenerator().generate_table(grammar)
+    legacy_time = (time.perf_counter() - start) / repeat
+    print('fixed point: %.2f ms, legacy: %.2f ms (%.1fx)' % (fixed_point_time * 1000, legacy_time * 1000, legacy_time / fixed_point_time))
+    # both generators must select the same production for every entry
+    if any(table[x] != legacy_table[x] for x in table):
+        print('parse tables differ')
+        sys.exit(1)
+    # and keep the entries of each row in the same order (the order of the expected tokens of errors)
+    if any(list(table[x]) != list(legacy_table[x]) for x in table):
+        print('parse table rows are ordered differently')
+        sys.exit(1)
+    print('%d conflicts' % len(conflicts))
+    for conflict in conflicts:
+        print('  %s' % conflict)
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else REPEAT)
@@ -1,24 +1,33 @@
 import os
 
 import syc.ast.parser as parser
+import syc.ast.cache as ast_cache
 from syc.ast.ast import ASTNode, unparse
 import syc.icg.generate as generate
+import syc.icg.relations as relations
+import syc.icg.types as types
+import syc.icg.interface as interface
+from syc.icg.passes import PassManager, pipelines
 
 import errormodule
+import profiler
 import syc.ast.lexer as lexer
 import util
-from lib.package_manager import get
+from lib.package_manager import resolver
 
 import re
 
 
-# dictionary to hold used imports
+# dictionary to hold loaded packages (key -> Unit)
 imports = {
 
 }
 
+# number of processes used to parse packages
+jobs = os.cpu_count() or 1
+
 # possible command modifiers
-MODIFIERS = ['--sandbox']
+MODIFIERS = ['--sandbox', '--stats', '--O0', '--O1', '--O2', '--O3', '--verify-passes', '--explain', '--profile']
 
 
 def build(args):
@@ -34,53 +43,313 @@ def build(args):
             util.build_file = arg
         else:
             mods.append(arg)
+    ast_cache.reset_stats()
+    relations.reset_stats()
+    profiler.reset('--profile' in mods)
+    with profiler.span('build', 'build'):
+        run_build(mods)
+    if '--profile' in mods:
+        print('Profile written to %s and %s' % profiler.write(os.path.splitext(util.build_file)[0]))
+
+
+# build the build file (util.build_file) with the given modifiers
+def run_build(mods):
+    # start from a clean state (a daemon runs many builds in the same process)
+    global imports
+    imports = {}
+    generate.packages.clear()
+    util.symbol_table = None
+    # types and relations are only cached for the current build (earlier builds' types are released)
+    types.interned.clear()
+    relations.reset()
     # first open and compile the startup file
     # loads all constants into memory
     with open(util.build_file) as file:
-        ast = get_ast(file.read())
-    global imports
+        code = file.read()
+    with profiler.span('resolve imports', 'build'):
+        ast = get_ast(code)
+    rebuilt = [x for x in imports.values() if x.reason]
+    if '--explain' in mods:
+        # the build file itself is always rebuilt
+        print('%s: rebuilt (build file)' % util.build_file)
+        for unit in imports.values():
+            print('%s: %s' % (unit.file_path, 'rebuilt (%s)' % unit.reason if unit.reason else 'loaded from interface'))
+    loaded = len(imports) - len(rebuilt)
     # reset imports (free memory)
     imports = {}
-    action_tree = generate.generate_tree(ast)
-    # TODO optimize action tree
+    with profiler.span('generate', 'icg', file=util.build_file):
+        action_tree = generate.generate_tree(ast)
+    # optimize action tree (the last optimization level given is used)
+    level = 0
+    for mod in mods:
+        if mod in {'--O0', '--O1', '--O2', '--O3'}:
+            level = int(mod[3])
+    pass_manager = PassManager(pipelines[level], '--verify-passes' in mods)
+    action_tree = pass_manager.run(action_tree)
     # TODO convert action tree to llvm code
+    if '--stats' in mods:
+        print('AST cache: %d hits, %d misses' % (ast_cache.stats['hits'], ast_cache.stats['misses']))
+        print('Packages: %d loaded from interfaces, %d rebuilt' % (loaded, len(rebuilt)))
+        for name in relations.stats:
+            print('Type relations (%s): %d hits, %d misses (%.1f%% hit rate)' % (name, relations.stats[name]['hits'], relations.stats[name]['misses'],
+                                                                              relations.hit_rate(name) * 100))
+        for name, elapsed, before, after in pass_manager.timings:
+            print('Pass %s: %.3f ms, %d -> %d nodes' % (name, elapsed * 1000, before, after))
+
+
+# package of the build (an included file)
+class Unit:
+    def __init__(self, key, file_path):
+        # packages are keyed by their directory and code as those decide what the package resolves to
+        self.key = key
+        self.directory, self.code = key
+        self.file_path = file_path
+        # ast of the package (None if it has not been parsed)
+        self.ast = None
+        # includes of the package in the order they appear in (include name, file path, key of the package, is used)
+        self.dependencies = []
+        # include statements of the package (parent node, position in parent, package info, key of the package)
+        self.links = []
+        # interface stored for the package's current source (None if there is none)
+        self.record = None
+        # generated (or loaded) IR Object of the package and the hashes of its exported symbols
+        self.content = None
+        self.symbol_hashes = None
+        # why the package was rebuilt (None if it was loaded from its interface)
+        self.reason = None
 
 
 # parse code to ast with resolved imports
-def get_ast(code):
-    # lex to tokens
+# includes are resolved relative to base (the working directory by default)
+# included packages are generated (or loaded from their interface) before the ast is returned
+def get_ast(code, base=None):
+    main = Unit((base if base else os.getcwd(), code), util.build_file)
+    main.ast = parse_sources([code], [util.build_file])[0]
+    discover(main)
+    # build the include graph bottom up (includes are built before the packages including them)
+    for unit in list(imports.values()):
+        build_unit(unit)
+    link(main)
+    return main.ast
+
+
+# discover the include graph one layer at a time
+# unchanged packages with an interface are not parsed (their includes are taken from the interface)
+def discover(main):
+    pending = [main]
+    while pending:
+        # packages that have to be parsed
+        wave = []
+        recorded = []
+        for unit in pending:
+            with profiler.span('find includes', 'imports', file=unit.file_path):
+                dependencies = list(get_dependencies(unit))
+            for name, file_path, key, used in dependencies:
+                unit.dependencies.append((name, file_path, key, used))
+                if key not in imports:
+                    dependency = imports[key] = Unit(key, file_path)
+                    with profiler.span('check interface', 'imports', file=file_path) as args:
+                        dependency.record = interface.load(key[1], key[0])
+                        dependency.reason = check_record(dependency)
+                        args['reason'] = dependency.reason
+                    if dependency.reason:
+                        wave.append(dependency)
+                    else:
+                        recorded.append(dependency)
+        # parse all of the new packages at once
+        for unit, tree in zip(wave, parse_sources([x.code for x in wave], [x.file_path for x in wave])):
+            unit.ast = tree
+        pending = recorded + wave
+
+
+# get the includes of a package (include name, file path, key of the package, is used)
+def get_dependencies(unit):
+    if not unit.ast:
+        # the includes were checked against the interface by check_record
+        for name, file_path, consumed, used in unit.record['dependencies']:
+            yield name, file_path, (os.path.realpath(os.path.dirname(file_path)), read_source(file_path)), used
+        return
+    for parent, ndx, include_stmt, extern in find_includes(unit.ast):
+        package = get_package(include_stmt, unit.directory, extern)
+        if not package:
+            continue
+        alias, used, pkg_code, path, name, file_path = package
+        key = (os.path.realpath(path), pkg_code)
+        unit.links.append((parent, ndx, util.Package(alias, extern, used, None), key))
+        yield name, file_path, key, used
+
+
+# check that the interface of a package can be used without parsing it (returns why it can not be, None if it can)
+# the includes of the package have to resolve to the same files they did when the interface was written
+def check_record(unit):
+    if not unit.record:
+        return 'new or changed source'
+    for name, file_path, consumed, used in unit.record['dependencies']:
+        try:
+            resolved = resolver.resolve(name, unit.directory)[0]
+        except FileNotFoundError:
+            return 'include \'%s\' can no longer be found' % name
+        if os.path.realpath(resolved) != os.path.realpath(file_path):
+            return 'include \'%s\' resolves to a different file (%s)' % (name, resolved)
+
+
+# read the source of a package
+def read_source(file_path):
+    with open(file_path) as file:
+        return file.read()
+
+
+# generate a package (its includes are built first)
+# packages whose source did not change are loaded from their interface unless an export they use changed
+def build_unit(unit):
+    if unit.content or unit.reason == 'building':
+        return
+    reason = unit.reason
+    # guard against include cycles
+    unit.reason = 'building'
+    for name, file_path, key, used in unit.dependencies:
+        build_unit(imports[key])
+    unit.reason = reason if reason else check_consumed(unit)
+    if not unit.reason:
+        with profiler.span('load package', 'imports', file=unit.file_path):
+            unit.content = load_package(unit)
+        if unit.content:
+            unit.symbol_hashes = unit.record['symbols']
+            return
+        unit.reason = 'interface could not be loaded'
+    if not unit.ast:
+        unit.ast = parse_sources([unit.code], [unit.file_path])[0]
+        # the includes are the same ones the interface recorded
+        unit.dependencies = list(get_dependencies(unit))
+    link(unit)
+    with profiler.span('generate', 'icg', file=unit.file_path, reason=unit.reason):
+        unit.content = generate.generate_package(unit.ast)
+    # record which exports of each include the package used
+    dependencies = []
+    consumed = unit.content.symbol_table.consumed
+    for name, file_path, key, used in unit.dependencies:
+        dependency = imports[key]
+        # packages including packages without an interface can not be checked
+        if not dependency.symbol_hashes:
+            return
+        names = set(consumed[id(dependency.content)][1]) if id(dependency.content) in consumed else set()
+        if used:
+            names.add(interface.NAMES)
+        dependencies.append((name, file_path, {x: dependency.symbol_hashes[x] for x in names if x in dependency.symbol_hashes}, used))
+    with profiler.span('store interface', 'imports', file=unit.file_path):
+        unit.symbol_hashes = interface.store(unit.code, unit.directory, dependencies, unit.content.symbol_table.exports)
+
+
+# check whether the exports a package used from its includes are unchanged (returns what changed, None if nothing did)
+def check_consumed(unit):
+    for (name, file_path, consumed, used), (_, _, key, _) in zip(unit.record['dependencies'], unit.dependencies):
+        symbol_hashes = imports[key].symbol_hashes
+        if not symbol_hashes:
+            return 'include \'%s\' has no interface' % name
+        for symbol in consumed:
+            if symbol_hashes.get(symbol) != consumed[symbol]:
+                if symbol == interface.NAMES:
+                    return 'the exports of used include \'%s\' changed' % name
+                return 'uses \'%s\' from \'%s\', which changed' % (symbol, name)
+
+
+# load the generated content of a package from its interface (None if it has to be generated)
+def load_package(unit):
+    return interface.load_content(unit.record)
+
+
+# replace the include statements of a package with their (built) packages
+def link(unit):
+    for parent, ndx, package, key in unit.links:
+        package.content = imports[key].content
+        parent.content[ndx] = package
+
+
+# parse a list of sources to ASTs (sources that are not cached are parsed in parallel)
+# names are the file paths of the sources (only used to profile them)
+def parse_sources(sources, names=None):
+    names = names if names else [None] * len(sources)
+    asts = []
+    for source, name in zip(sources, names):
+        with profiler.span('load cached ast', 'parse', file=name) as args:
+            asts.append(ast_cache.load(source))
+            args['hit'] = asts[-1] is not None
+    missing = [i for i in range(len(asts)) if not asts[i]]
+    # starting the worker processes is only worth it if there is more than one source and more than one core
+    if len(missing) > 1 and jobs > 1:
+        # the process pool is loaded on first use
+        from concurrent.futures import ProcessPoolExecutor
+        with profiler.span('parse in parallel', 'parse', files=len(missing), jobs=jobs), ProcessPoolExecutor(jobs) as executor:
+            results = executor.map(parse_encoded, [sources[i] for i in missing], [names[i] for i in missing], [profiler.enabled] * len(missing))
+            for i, (data, spans) in zip(missing, results):
+                profiler.merge(spans)
+                with profiler.span('decode ast', 'parse', file=names[i]):
+                    asts[i] = ast_cache.decode(data, errormodule.Source(sources[i]))
+    else:
+        for i in missing:
+            asts[i] = parse(sources[i], names[i])
+    return asts
+
+
+# lex and parse code to an ast (without resolving imports)
+# tokens are streamed from the lexer to the parser, so the token list is never held in memory
+def parse(code, name=None):
+    # the parse table is only generated (or loaded) by the first parse
+    with profiler.span('parse table', 'parse'):
+        parser.get_compiled_table()
     lx = lexer.Lexer()
-    tokens = lx.lex(code)
+    if profiler.enabled:
+        # profiled builds lex up front so lexing and parsing are timed apart
+        with profiler.span('lex', 'parse', file=name, size=len(code)) as args:
+            tokens = lx.lex(code)
+            args['tokens'] = len(tokens)
+    else:
+        tokens = lx.tokens(code)
     # parse to AST
-    pr = parser.Parser(tokens)
-    ast = pr.parse()
-    # get all the imports and the package objects
-    return resolve_imports(ast)
+    with profiler.span('parse', 'parse', file=name) as args:
+        pr = parser.Parser(tokens)
+        ast = pr.parse()
+        if profiler.enabled:
+            args['nodes'] = profiler.ast_size(ast)
+    with profiler.span('store cached ast', 'parse', file=name):
+        ast_cache.store(code, ast)
+    return ast
 
 
-# loads in package objects
-def resolve_imports(ast):
-    # iterate through ast
-    for i in range(len(ast.content)):
-        item = ast.content[i]
-        if isinstance(item, ASTNode):
-            # if these is an include statement, process it
-            if item.name == 'include_stmt':
-                ast.content[i] = load_package(item)
-            # check extern includes
-            if item.name == 'external_stmt':
-                # if it is an inclusion
-                if item.content[1].content[0].name == 'include_stmt':
-                    # parse it and add to table
-                    ast.content[i] = load_package(item.content[1].content[0], True)
-            # recur and continue checking for includes
-            else:
-                ast.content[i] = resolve_imports(item)
-    return ast
+# parse code in a worker process (ASTs are too deep to be pickled so they are sent back flattened)
+# returns the encoded ast and the spans recorded while parsing it (if profiling)
+def parse_encoded(code, name=None, profile=False):
+    profiler.reset(profile)
+    ast = parse(code, name)
+    return ast_cache.encode(ast), list(profiler.spans)
+
 
+# find all of the include statements in an ast (parent node, position in parent, include_stmt, is external)
+def find_includes(ast):
+    includes = []
+    nodes = [ast]
+    while nodes:
+        node = nodes.pop()
+        sub_nodes = []
+        for i in range(len(node.content)):
+            item = node.content[i]
+            if isinstance(item, ASTNode):
+                # if these is an include statement, process it
+                if item.name == 'include_stmt':
+                    includes.append((node, i, item, False))
+                # check extern includes
+                elif item.name == 'external_stmt' and item.content[1].content[0].name == 'include_stmt':
+                    includes.append((node, i, item.content[1].content[0], True))
+                # continue checking for includes
+                else:
+                    sub_nodes.append(item)
+        # keep includes in the order they appear in
+        nodes.extend(reversed(sub_nodes))
+    return includes
 
-# open package from ast
-def load_package(include_stmt, extern=False):
+
+# get the alias, usage, code, directory, name and file path of a package from its include statement
+def get_package(include_stmt, base, extern=False):
     # package name
     name = ''
     # if it is anonymous
@@ -107,32 +376,15 @@ def load_package(include_stmt, extern=False):
     # package cannot be used and external
     if used and extern:
         errormodule.throw('package_error', 'Package cannot be both external and anonymous.', include_stmt)
-    # if get fails due to file path not being found
+    # if resolving fails due to file path not being found
     try:
-        code, path = get(name)
+        file_path, path = resolver.resolve(name, base)
+        with open(file_path) as file:
+            code = file.read()
     except FileNotFoundError:
         errormodule.throw('package_error', 'Unable to locate package by name \'%s\'.' % name, include_stmt)
         return
-    # prevent redundant imports
-    if name in imports:
-        ast = imports[name]
-    # if working directory needs to be updated
-    elif path:
-        # store cwd
-        cwd = os.getcwd()
-        # chdir to the parent directory of the file to allow for local importing
-        os.chdir(path)
-        # get the data necessary
-        ast = get_ast(code)
-        # change back to cwd
-        os.chdir(cwd)
-    else:
-        # just get the ast, no cwd recursion necessary
-        ast = get_ast(code)
     # set alias if there was none provided
     if not alias:
         alias = name
-    if name not in imports:
-        imports[name] = ast
-    return util.Package(alias, extern, used, ast)
-
+    return alias, used, code, path, name, file_path
@@ -0,0 +1,148 @@
+import contextlib
+import io
+import json
+import os
+import socket
+import socketserver
+import traceback
+
+import util
+
+# compiler daemon
+# keeps the lexer, parse table, package index and parsed packages in memory so builds do not pay for loading them
+# builds are forwarded over a unix socket and run one at a time (the compiler uses global state)
+
+# default path of the daemon's socket
+SOCKET_PATH = util.CACHE_DIR + '/syclone.sock'
+
+# number of parsed packages and interfaces kept in memory between builds
+RETAINED_ASTS = 512
+RETAINED_INTERFACES = 512
+
+
+# get the socket path given by --socket PATH (the default path otherwise) and the remaining arguments
+def get_socket_path(args):
+    args = list(args)
+    path = SOCKET_PATH
+    if '--socket' in args:
+        ndx = args.index('--socket')
+        if ndx + 1 >= len(args):
+            raise util.SyCloneRecoverableError('No socket path specified.')
+        path = args[ndx + 1]
+        del args[ndx:ndx + 2]
+    return path, args
+
+
+# load everything a build needs that does not depend on the build file
+def warm_up():
+    import build
+    import syc.ast.parser as parser
+    import syc.ast.lexer as lexer
+    import syc.ast.cache as ast_cache
+    import syc.icg.interface as interface
+    from lib.package_manager import resolver
+    # keep the most recently used parsed packages and interfaces in memory between builds
+    ast_cache.retained = util.LRUCache(RETAINED_ASTS)
+    interface.retained = util.LRUCache(RETAINED_INTERFACES)
+    lexer.Lexer()
+    parser.get_compiled_table()
+    resolver.refresh()
+    # parse the core library up front
+    corelib = util.SOURCE_DIR + '/lib/corelib'
+    for file_name in sorted(os.listdir(corelib)):
+        if file_name.endswith('.sy'):
+            with open(corelib + '/' + file_name) as file:
+                source = file.read()
+            # sources that do not parse are reported once they are built
+            with contextlib.redirect_stdout(io.StringIO()):
+                try:
+                    build.parse_sources([source])
+                except SystemExit:
+                    pass
+
+
+# run a build in the daemon's process (returns the output of the build and its exit status)
+def run_build(directory, args):
+    import build
+    output = io.StringIO()
+    status = 0
+    cwd = os.getcwd()
+    with contextlib.redirect_stdout(output):
+        try:
+            os.chdir(directory)
+            build.build(args)
+        except util.SyCloneRecoverableError as e:
+            print(e)
+            status = 1
+        # syntax errors exit the build
+        except SystemExit as e:
+            status = e.code if isinstance(e.code, int) else 1
+        # the daemon has to outlive any build
+        except Exception:
+            traceback.print_exc(file=output)
+            status = 1
+        finally:
+            os.chdir(cwd)
+    return output.getvalue(), status
+
+
+class BuildHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        request = json.loads(self.rfile.read().decode())
+        output, status = run_build(request['directory'], request['args'])
+        self.wfile.write(json.dumps({'output': output, 'status': status}).encode())
+
+
+# syclone serve [--socket PATH]
+def serve(args):
+    path, args = get_socket_path(args)
+    if args:
+        raise util.SyCloneRecoverableError('Unknown arguments: %s' % ' '.join(args))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # remove the socket of a daemon that did not shut down cleanly
+    if os.path.exists(path):
+        client = connect(path)
+        if client:
+            client.close()
+            raise util.SyCloneRecoverableError('A daemon is already listening on \'%s\'.' % path)
+        os.remove(path)
+    warm_up()
+    server = socketserver.UnixStreamServer(path, BuildHandler)
+    print('Listening on %s' % path)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        os.remove(path)
+
+
+# connect to a daemon (None if none is listening)
+def connect(path):
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(path)
+    except OSError:
+        client.close()
+        return
+    return client
+
+
+# forward a build to a daemon (returns the exit status of the build, None if no daemon is listening)
+def forward(args):
+    path, args = get_socket_path(args)
+    client = connect(path)
+    if not client:
+        return
+    with client:
+        client.sendall(json.dumps({'directory': os.getcwd(), 'args': args}).encode())
+        client.shutdown(socket.SHUT_WR)
+        data = b''
+        chunk = client.recv(65536)
+        while chunk:
+            data += chunk
+            chunk = client.recv(65536)
+    response = json.loads(data.decode())
+    print(response['output'], end='')
+    return response['status']
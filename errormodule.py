@@ -1,30 +1,25 @@
 import re
+from bisect import bisect_right
 from util import SyCloneRecoverableError
 from syc.ast.ast import ASTNode, unparse
 
-code = ""
 
+# line index for a single source file (every token holds the source it was lexed from)
+class Source:
+    def __init__(self, code):
+        self.code = code
+        # offset of the first character of every line
+        self.line_starts = [0] + [x.end() for x in re.finditer("\n", code)]
 
-def get_position(ndx):
-    new_lines = list(re.finditer("\n", code))
-    if len(new_lines) == 0:
-        return [0, ndx]
-    line = 0
-    for num in range(len(new_lines)):
-        if ndx <= new_lines[num].start():
-            if num > 0:
-                ndx -= new_lines[num - 1].start() + 1
-                break
-            else:
-                break
-        line += 1
-    else:
-        ndx -= new_lines[-1].start() + 1
-    return line, ndx
-
+    # convert an offset in the source to a line and position in that line
+    def get_position(self, ndx):
+        line = bisect_right(self.line_starts, ndx) - 1
+        return line, ndx - self.line_starts[line]
 
-def getln(line, ndx, len_carrots):
-    return code.split("\n")[line] + "\n" + " " * ndx + ("^" * len_carrots)
+    def getln(self, line, ndx, len_carrots):
+        # the line ends just before the start of the next line (or at the end of the source)
+        end = self.line_starts[line + 1] - 1 if line + 1 < len(self.line_starts) else len(self.code)
+        return self.code[self.line_starts[line]:end] + "\n" + " " * ndx + ("^" * len_carrots)
 
 
 def throw(error_type, error, params):
@@ -39,7 +34,7 @@ def warn(message, params):
         raw_tokens = unparse(params)
     else:
         raw_tokens = [params]
-    line, ndx = get_position(raw_tokens[0].ndx)
+    line, ndx = raw_tokens[0].source.get_position(raw_tokens[0].ndx)
     print('[WARNING] %s %s' % (message, '[line:%d position:%d]' % (line, ndx)))
 
 
@@ -49,17 +44,19 @@ def _print_semantic_error(message, params):
     else:
         raw_tokens = [params]
     len_carrots = (raw_tokens[-1].ndx + len(raw_tokens[-1].value)) - raw_tokens[0].ndx if len(raw_tokens) > 1 else len(raw_tokens[0].value)
-    line, ndx = get_position(raw_tokens[0].ndx)
+    source = raw_tokens[0].source
+    line, ndx = source.get_position(raw_tokens[0].ndx)
     message += ' [line:%d position:%d]' % (line, ndx)
-    message += '\n\n%s' % getln(line, ndx, len_carrots)
+    message += '\n\n%s' % source.getln(line, ndx, len_carrots)
     raise SyCloneRecoverableError(message)
 
 
 def _print_syntax_error(message, params):
     len_carrots = len(params[0].value)
-    line, ndx = get_position(params[0].ndx)
+    source = params[0].source
+    line, ndx = source.get_position(params[0].ndx)
     message += ' [line:%d position:%d]' % (line, ndx)
-    message += '\n\n%s' % getln(line, ndx, len_carrots)
+    message += '\n\n%s' % source.getln(line, ndx, len_carrots)
     if len(params[1]) > 0:
         message += '\n\nExpected: ' + (', '.join(map(token_transform, params[1])) if isinstance(params[1], list) else token_transform(params[1]))
     print(message)
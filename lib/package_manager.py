@@ -1,52 +1,66 @@
+import os
 import util
 import json
 
 
-# used to locally retrieve a package
-# name is the raw code identifier (ie http.client or compiler.parser)
-def get(name):
-    # open the package index
-    with open(util.SOURCE_DIR + '/lib/package_index.json') as file:
-        index = json.load(file)
-    # split name by .
-    name_list = name.split('.')
-    # if the beginning of the name is in the package index (suffixes ignored)
-    # applies for names such as http.client (would find package http)
-    if name_list[0] in index:
-        # find the raw path to package directory
-        # combine it with full source directory path to prevent path ambiguity
-        pkg_path = util.SOURCE_DIR + '/lib/packages/' + index[name_list[0]]
-        # if the only path is to the main directory, load the main package file (__index__.sy)
-        if len(name_list) == 1:
-            with open(pkg_path + '/__index__.sy') as pkg_file:
-                data = pkg_file.read()
-            # only return the raw path to the package
-            return data, pkg_path
-        # if sub paths or sub files are accessed
-        else:
-            # get the final file name
-            file_name = name_list.pop()
-            # if there is full sub path and not just a sub file
-            if len(name_list[1:]) > 0:
-                # create a string sub path to follow
-                # NOTE the .. syntax is NOT acceptable here
-                # it is assumed that there should be no necessity to traverse the inward AND outward as
-                # user begins in the parent directory
-                str_path = '/'.join(name_list[1:])
-                # synthesize full path from the package path, the sub path, and finally the sub file path
-                with open(pkg_path + '/%s/%s.sy' % (str_path, file_name)) as pkg_file:
-                    data = pkg_file.read()
-                # return path only combines package path and sub path ignoring sub file (for chdir)
-                return data, pkg_path + '/' + str_path
-            # if it is just a sub file
-            else:
-                with open(pkg_path + '/%s.sy') as pkg_file:
-                    data = pkg_file.read()
-                # still return raw package path as it is just a sub file
-                return data, pkg_path
-    # if package not in package index, interpret as literal directory
-    # where . = /  and .. = ../
-    else:
+# resolves package names to source files
+# the package index is loaded once (and reloaded if it changes) and every file in the indexed packages is mapped up front
+class PackageResolver:
+    def __init__(self):
+        self.index_path = util.SOURCE_DIR + '/lib/package_index.json'
+        # modification time of the loaded index
+        self.mtime = None
+        # package name -> package directory
+        self.packages = {}
+        # full package name (ie http.client) -> (source file path, directory of the source file)
+        self.files = {}
+
+    # reload the index if it has changed since it was loaded
+    def refresh(self):
+        mtime = os.stat(self.index_path).st_mtime_ns
+        if mtime == self.mtime:
+            return
+        with open(self.index_path) as file:
+            index = json.load(file)
+        self.mtime = mtime
+        self.files = {}
+        # combine the package paths with full source directory path to prevent path ambiguity
+        self.packages = {x: util.SOURCE_DIR + '/lib/packages/' + index[x] for x in index}
+        for package in self.packages:
+            self.scan(package)
+
+    # map all of the source files in a package
+    def scan(self, package):
+        pkg_path = self.packages[package]
+        for directory, _, files in os.walk(pkg_path):
+            # sub path of the directory inside of the package
+            sub_path = os.path.relpath(directory, pkg_path).replace(os.sep, '.')
+            prefix = package if sub_path == '.' else package + '.' + sub_path
+            for file_name in files:
+                if file_name.endswith('.sy'):
+                    self.files[prefix + '.' + file_name[:-3]] = (directory + '/' + file_name, directory)
+        # the main package file (__index__.sy) is loaded when only the package is named
+        if package + '.__index__' in self.files:
+            self.files[package] = self.files[package + '.__index__']
+
+    # get the source file path and the directory to resolve its includes from
+    # name is the raw code identifier (ie http.client or compiler.parser)
+    # base is the directory non-indexed packages are found relative to
+    def resolve(self, name, base='.'):
+        self.refresh()
+        # split name by .
+        name_list = name.split('.')
+        # if the beginning of the name is in the package index (suffixes ignored)
+        # applies for names such as http.client (would find package http)
+        if name_list[0] in self.packages:
+            if name not in self.files:
+                # the package may have gained files since it was mapped
+                self.scan(name_list[0])
+                if name not in self.files:
+                    raise FileNotFoundError('No package file for \'%s\'' % name)
+            return self.files[name]
+        # if package not in package index, interpret as literal directory
+        # where . = /  and .. = ../
         # file name is end of the split name
         # for example, in tests.test1, test1(.sy) is the file name
         file_name = name_list.pop()
@@ -54,15 +68,18 @@ def get(name):
         for i in range(len(name_list)):
             if name_list[i] == '':
                 name_list[i] = '..'
-        # if there is a traversable directory path, follow it
-        if len(name_list) > 0:
-            path = '/'.join(name_list) + '/%s.sy' % file_name
-            with open(path) as source_file:
-                data = source_file.read()
-            return data, '/'.join(name_list)
-        # otherwise just load straight for source filename
-        else:
-            with open(file_name + '.sy') as source_file:
-                data = source_file.read()
-            # None means no path needs to be changed to
-            return data, None
+        # directory of the source file (the base directory if there is no traversable directory path)
+        path = os.path.join(base, *name_list)
+        return path + '/%s.sy' % file_name, path
+
+
+# package resolver shared by the whole process
+resolver = PackageResolver()
+
+
+# used to locally retrieve a package (returns the package code and the directory to resolve its includes from)
+def get(name, base='.'):
+    path, directory = resolver.resolve(name, base)
+    with open(path) as file:
+        data = file.read()
+    return data, directory
@@ -0,0 +1,145 @@
+import json
+import os
+import time
+from contextlib import contextmanager
+
+from syc.ast.ast import ASTNode
+
+# build profiler
+# records nested spans of time for each phase of a build (and each package) when a build is given --profile
+# spans are written as chrome trace events (chrome://tracing, perfetto) and as a text summary sorted by self time
+
+# whether or not spans are being recorded
+enabled = False
+
+# finished spans (name, category, start, duration, args, depth, process id) in the order they finished
+spans = []
+
+# number of spans currently open
+depth = 0
+
+
+# start a new profile (spans are only recorded if enabled)
+def reset(enable):
+    global enabled, depth
+    enabled = enable
+    depth = 0
+    del spans[:]
+
+
+# record the time spent in a block
+# the args of the span are yielded so information found in the block (token counts, ect.) can be added to it
+@contextmanager
+def span(name, category, **args):
+    if not enabled:
+        yield args
+        return
+    global depth
+    start = time.perf_counter()
+    depth += 1
+    try:
+        yield args
+    finally:
+        depth -= 1
+        spans.append((name, category, start, time.perf_counter() - start, args, depth, os.getpid()))
+
+
+# add spans recorded by another process (perf_counter is system wide, so their times line up)
+def merge(other_spans):
+    for name, category, start, duration, args, span_depth, pid in other_spans:
+        spans.append((name, category, start, duration, args, depth + span_depth, pid))
+
+
+# count the nodes and tokens of an ast
+def ast_size(ast):
+    count = 0
+    nodes = [ast]
+    while nodes:
+        node = nodes.pop()
+        count += 1
+        if isinstance(node, ASTNode):
+            nodes.extend(node.content)
+    return count
+
+
+# get the self time of every span (its duration without the spans nested in it)
+def self_times():
+    times = [x[3] for x in spans]
+    # spans ordered by start (outer spans first) with their nesting tracked separately for each process
+    open_spans = {}
+    for i in sorted(range(len(spans)), key=lambda x: (spans[x][2], spans[x][5])):
+        name, category, start, duration, args, span_depth, pid = spans[i]
+        stack = open_spans.setdefault(pid, [])
+        while stack and spans[stack[-1]][2] + spans[stack[-1]][3] <= start:
+            stack.pop()
+        if stack:
+            times[stack[-1]] -= duration
+        stack.append(i)
+    return times
+
+
+# convert the spans to chrome trace events (times are in microseconds)
+def trace_events():
+    if not spans:
+        return []
+    origin = min(x[2] for x in spans)
+    events = []
+    for name, category, start, duration, args, span_depth, pid in spans:
+        events.append({
+            'name': name,
+            'cat': category,
+            'ph': 'X',
+            'ts': (start - origin) * 1e6,
+            'dur': duration * 1e6,
+            'pid': pid,
+            'tid': pid,
+            'args': args
+        })
+    # viewers expect events in order of their start
+    events.sort(key=lambda x: (x['ts'], -x['dur']))
+    return events
+
+
+# get the text summary of the profile (phases and packages sorted by self time, then the slowest spans)
+def summary(count=20):
+    times = self_times()
+    total = sum(times)
+    lines = ['Total (all processes): %.3f ms' % (total * 1000), '']
+    # self time by phase [count, self time]
+    phases = {}
+    # self time and details by package [self time, size, tokens, nodes]
+    packages = {}
+    for (name, category, start, duration, args, span_depth, pid), self_time in zip(spans, times):
+        phase = phases.setdefault((category, name), [0, 0])
+        phase[0] += 1
+        phase[1] += self_time
+        if 'file' in args:
+            package = packages.setdefault(args['file'], [0, None, None, None])
+            package[0] += self_time
+            for i, key in enumerate(['size', 'tokens', 'nodes']):
+                if key in args:
+                    package[i + 1] = args[key]
+    lines.append('%-40s %8s %12s %8s' % ('phase', 'count', 'self (ms)', '%'))
+    for (category, name), (phase_count, self_time) in sorted(phases.items(), key=lambda x: -x[1][1]):
+        lines.append('%-40s %8d %12.3f %8.1f' % ('%s: %s' % (category, name), phase_count, self_time * 1000, self_time / total * 100 if total else 0))
+    if packages:
+        lines.append('')
+        lines.append('%-40s %12s %10s %10s %10s' % ('package', 'self (ms)', 'size', 'tokens', 'nodes'))
+        for file_path, (self_time, size, tokens, nodes) in sorted(packages.items(), key=lambda x: -x[1][0]):
+            lines.append('%-40s %12.3f %10s %10s %10s' % (file_path, self_time * 1000, *['-' if x is None else x for x in (size, tokens, nodes)]))
+    lines.append('')
+    lines.append('%-40s %12s %12s  %s' % ('slowest spans', 'self (ms)', 'total (ms)', 'args'))
+    for i in sorted(range(len(spans)), key=lambda x: -times[x])[:count]:
+        name, category, start, duration, args, span_depth, pid = spans[i]
+        lines.append('%-40s %12.3f %12.3f  %s' % ('%s: %s' % (category, name), times[i] * 1000, duration * 1000,
+                                                 ', '.join('%s=%s' % (x, args[x]) for x in sorted(args))))
+    return '\n'.join(lines) + '\n'
+
+
+# write the profile as a chrome trace (path + '.trace.json') and a text summary (path + '.profile.txt')
+def write(path):
+    with open(path + '.trace.json', 'w') as file:
+        json.dump({'traceEvents': trace_events(), 'displayTimeUnit': 'ms'}, file)
+    with open(path + '.profile.txt', 'w') as file:
+        file.write(summary())
+    return path + '.trace.json', path + '.profile.txt'
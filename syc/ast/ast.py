@@ -1,9 +1,14 @@
 # token class for ASTs
 class Token:
-    def __init__(self, type, value, ndx):
+    # slotted as one is allocated for every token in the source
+    __slots__ = ('type', 'value', 'ndx', 'source')
+
+    def __init__(self, type, value, ndx, source=None):
         self.type = type
         self.value = value
         self.ndx = ndx
+        # errormodule.Source of the file the token is from
+        self.source = source
 
     def __str__(self):
         return "Token('%s', '%s')" % (self.type, self.value)
@@ -11,6 +16,9 @@ class Token:
 
 # default AST node class
 class ASTNode:
+    # slotted as one is allocated for every nonterminal in the AST
+    __slots__ = ('name', 'content')
+
     def __init__(self, name):
         self.name = name
         self.content = []
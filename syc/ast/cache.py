@@ -0,0 +1,129 @@
+import gc
+import hashlib
+import marshal
+from contextlib import contextmanager
+
+import errormodule as er
+import util
+import syc.ast.grammar as gramtools
+from syc.ast.ast import ASTNode, Token
+
+# version of the cached AST format (increment whenever the encoding changes)
+AST_CACHE_VERSION = 1
+
+# hits and misses since the last reset
+stats = {
+    'hits': 0,
+    'misses': 0
+}
+
+# hash of everything (other than the source) that decides the shape of an AST
+_config_hash = None
+
+# encoded ASTs kept in memory by their cache path (None unless enabled by a long running process, see daemon)
+retained = None
+
+
+def reset_stats():
+    stats['hits'] = 0
+    stats['misses'] = 0
+
+
+# get the hash of the grammar, the token set and the cache format
+def get_config_hash():
+    global _config_hash
+    if not _config_hash:
+        with open(util.SOURCE_DIR + '/config/tokens.json', 'rb') as file:
+            tokens_hash = hashlib.sha256(file.read()).hexdigest()
+        _config_hash = '%d:%d:%s:%s' % (AST_CACHE_VERSION, marshal.version, gramtools.grammar_hash(), tokens_hash)
+    return _config_hash
+
+
+# get the path of the cached AST for a source
+def get_path(code):
+    key = hashlib.sha256((get_config_hash() + '\n' + code).encode()).hexdigest()
+    return '%s/ast/%s.ast' % (util.CACHE_DIR, key)
+
+
+# pause the garbage collector (it would run many times while a tree is rebuilt and ASTs have no cycles to collect)
+@contextmanager
+def paused_gc():
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+# load the cached AST of a source (None if it has not been cached)
+def load(code):
+    path = get_path(code)
+    try:
+        if retained is not None and path in retained:
+            ast = decode(retained[path], er.Source(code))
+        else:
+            with paused_gc(), open(path, 'rb') as file:
+                data = marshal.load(file)
+            ast = decode(data, er.Source(code))
+            if retained is not None:
+                retained[path] = data
+    # missing or corrupt caches are misses
+    except (OSError, ValueError, EOFError, TypeError, IndexError):
+        stats['misses'] += 1
+        return
+    stats['hits'] += 1
+    return ast
+
+
+# cache the AST of a source (before imports have been resolved)
+def store(code, ast):
+    data = encode(ast)
+    if retained is not None:
+        retained[get_path(code)] = data
+    util.write_cache(get_path(code), marshal.dumps(data))
+
+
+# flatten an AST into a postorder list of symbols
+# tokens are encoded as type id << 1 | 1 (with their value and ndx stored in order)
+# nodes are encoded as child count << 17 | name id << 1 and take their children off of the end of the decoded list
+def encode(ast):
+    names = {}
+    # reversed preorder (children visited right to left) is the reverse of the postorder
+    order = []
+    items = [ast]
+    while items:
+        item = items.pop()
+        order.append(item)
+        if isinstance(item, ASTNode):
+            items.extend(item.content)
+    shape, values, ndxs = [], [], []
+    for item in reversed(order):
+        if isinstance(item, Token):
+            shape.append(names.setdefault(item.type, len(names)) << 1 | 1)
+            values.append(item.value)
+            ndxs.append(item.ndx)
+        else:
+            shape.append(len(item.content) << 17 | names.setdefault(item.name, len(names)) << 1)
+    return [x for x in names], shape, values, ndxs
+
+
+# rebuild an AST from its flattened form
+def decode(data, source):
+    names, shape, values, ndxs = data
+    items = []
+    token_pos = 0
+    with paused_gc():
+        for symbol in shape:
+            if symbol & 1:
+                items.append(Token(names[symbol >> 1], values[token_pos], ndxs[token_pos], source))
+                token_pos += 1
+            else:
+                node = ASTNode(names[symbol >> 1 & 0xFFFF])
+                count = symbol >> 17
+                if count:
+                    node.content = items[-count:]
+                    del items[-count:]
+                items.append(node)
+    return items[0]
@@ -1,3 +1,4 @@
+import hashlib
 import json
 import util
 
@@ -37,3 +38,185 @@ def build_grammar():
             if terminal not in grammar.terminals:
                 grammar.terminals.append(terminal)
     return grammar
+
+
+# hash of the grammar file (used to key anything generated from the grammar)
+def grammar_hash():
+    with open(util.SOURCE_DIR + "/config/grammars.json", "rb") as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+
+# LL(1) conflict found while generating a parse table
+class Conflict:
+    def __init__(self, nonterminal, terminal, productions):
+        self.nonterminal = nonterminal
+        self.terminal = terminal
+        # every production that claimed the table entry (the last one is kept in the table)
+        self.productions = productions
+
+    def __str__(self):
+        return "Conflict(%s, %s, [%s])" % (self.nonterminal, self.terminal, ", ".join(" ".join(x) for x in self.productions))
+
+
+# get the set of all nonterminals that can derive epsilon
+def nullable_set(grammar):
+    nullable = set()
+    # iterate to a fixed point (a production is nullable if every symbol in it is)
+    changed = True
+    while changed:
+        changed = False
+        for name in grammar.productions:
+            if name in nullable:
+                continue
+            for production in grammar.productions[name]:
+                if all(x == "&" or x in nullable for x in production):
+                    nullable.add(name)
+                    changed = True
+                    break
+    return frozenset(nullable)
+
+
+# get the first set of a sequence of symbols ("&" is included if the whole sequence is nullable)
+def first_of(sequence, first, nullable):
+    first_set = set()
+    for symbol in sequence:
+        if symbol == "&":
+            continue
+        # nonterminals contribute their first set and only continue if they are nullable
+        if symbol in first:
+            first_set |= first[symbol]
+            if symbol not in nullable:
+                return first_set
+        # terminals end the sequence
+        else:
+            first_set.add(symbol)
+            return first_set
+    first_set.add("&")
+    return first_set
+
+
+# get the first sets of all nonterminals (not including epsilon, use nullable for that)
+def first_sets(grammar, nullable):
+    first = {x: set() for x in grammar.productions}
+    # nonterminals whose first sets need to be updated when a nonterminal's first set changes
+    dependents = {x: set() for x in grammar.productions}
+    for name in grammar.productions:
+        for production in grammar.productions[name]:
+            for symbol in production:
+                if symbol in dependents:
+                    dependents[symbol].add(name)
+                    if symbol in nullable:
+                        continue
+                if symbol != "&":
+                    break
+    # worklist fixed point
+    worklist = [x for x in grammar.productions]
+    queued = set(worklist)
+    while worklist:
+        name = worklist.pop()
+        queued.remove(name)
+        first_set = set()
+        for production in grammar.productions[name]:
+            first_set |= first_of(production, first, nullable)
+        first_set.discard("&")
+        # first sets only ever grow, so any change is a change in size
+        if len(first_set) != len(first[name]):
+            first[name] = first_set
+            for dependent in dependents[name]:
+                if dependent not in queued:
+                    worklist.append(dependent)
+                    queued.add(dependent)
+    return {x: frozenset(first[x]) for x in first}
+
+
+# get the follow sets of all nonterminals
+def follow_sets(grammar, first, nullable):
+    follow = {x: set() for x in grammar.productions}
+    follow[grammar.start_symbol].add("$")
+    # nonterminals that inherit the follow set of each nonterminal (they end one of its productions)
+    inherits = {x: set() for x in grammar.productions}
+    for name in grammar.productions:
+        for production in grammar.productions[name]:
+            for i, symbol in enumerate(production):
+                if symbol in follow:
+                    rest = first_of(production[i + 1:], first, nullable)
+                    if "&" in rest:
+                        rest.remove("&")
+                        if symbol != name:
+                            inherits[name].add(symbol)
+                    follow[symbol] |= rest
+    # propagate inherited follow sets to a fixed point
+    worklist = [x for x in grammar.productions]
+    while worklist:
+        name = worklist.pop()
+        for symbol in inherits[name]:
+            if not follow[name] <= follow[symbol]:
+                follow[symbol] |= follow[name]
+                worklist.append(symbol)
+    return {x: frozenset(follow[x]) for x in follow}
+
+
+# get the lookaheads of every production (by nonterminal, in production order) in the order they are found by walking
+# the grammar depth first (the order of the original recursive generator)
+# the sets above decide which terminals select a production, this only orders the entries of each table row
+# (and so the expected tokens of syntax errors)
+def lookahead_orders(grammar):
+    firsts = {}
+    follows = {}
+
+    # first symbols of a nonterminal ("&" where a production can be empty)
+    def nonterminal_first(name):
+        if name not in firsts:
+            # guards against left recursion
+            firsts[name] = []
+            items = []
+            for production in grammar.productions[name]:
+                for item in sequence_first(production, 0):
+                    if item not in items:
+                        items.append(item)
+            firsts[name] = items
+        return firsts[name]
+
+    # first symbols of a production from pos ("&" if the rest of it can be empty)
+    def sequence_first(production, pos):
+        if production[pos] not in grammar.productions:
+            return [production[pos]]
+        items = []
+        for item in nonterminal_first(production[pos]):
+            if item != "&":
+                items.append(item)
+            elif pos + 1 < len(production):
+                items += sequence_first(production, pos + 1)
+            else:
+                items.append(item)
+        return items
+
+    def follow(symbol):
+        if symbol not in follows:
+            # guards against cycles of productions ending in each other
+            follows[symbol] = []
+            items = ["$"] if symbol == grammar.start_symbol else []
+            for name in grammar.productions:
+                for production in grammar.productions[name]:
+                    if symbol not in production:
+                        continue
+                    ndx = production.index(symbol)
+                    rest = sequence_first(production, ndx + 1) if ndx < len(production) - 1 else ["&"]
+                    for item in rest:
+                        for x in (follow(name) if symbol != name else []) if item == "&" else [item]:
+                            if x not in items:
+                                items.append(x)
+            follows[symbol] = items
+        return follows[symbol]
+
+    orders = {}
+    for name in grammar.productions:
+        orders[name] = []
+        for production in grammar.productions[name]:
+            items = []
+            for item in sequence_first(production, 0):
+                for x in follow(name) if item == "&" else [item]:
+                    if x not in items:
+                        items.append(x)
+            orders[name].append(items)
+    return orders
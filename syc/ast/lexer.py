@@ -5,50 +5,99 @@ import errormodule as er
 import util
 from syc.ast.ast import Token
 
+# token templates of the form \bword\b or \b(word|word)\b
+KEYWORD_TEMPLATE = re.compile(r"\\b\(?([\w|]+)\)?\\b")
+
+# used to check that a folded keyword is a whole word
+WORD_BOUNDARY = re.compile(r"\b")
+
+# token set and master pattern shared by all lexers in the process (token types, token names, keywords, master)
+_token_config = None
+
 
 class Lexer:
     def __init__(self):
         # creates a holder for the inital code
         self.code = ""
+        global _token_config
+        # the token set is only loaded and compiled by the first lexer
+        if _token_config:
+            self.tokenTypes, self.token_names, self.keywords, self.master = _token_config
+            return
         # provides a set of tokens and their templates
         self.tokenTypes = json.loads(open(util.SOURCE_DIR + "/config/tokens.json").read())
+        # token names indexed by their group in the master pattern
+        self.token_names = [x for x in self.tokenTypes]
+        # keywords resolved through the template that hosts them (group name -> {word: token})
+        self.keywords = {}
+        # single pattern holding every token template in priority order
+        self.master = self.compile_master()
+        _token_config = (self.tokenTypes, self.token_names, self.keywords, self.master)
+
+    # builds one alternation out of all of the token templates
+    def compile_master(self):
+        alternatives = []
+        for i, token in enumerate(self.token_names):
+            host = self.get_keyword_host(i)
+            # keywords are not tried at every position, they are looked up after their host matches
+            if host:
+                words = self.keywords.setdefault("T%d" % host, {})
+                for word in KEYWORD_TEMPLATE.fullmatch(self.tokenTypes[token]).group(1).split("|"):
+                    words.setdefault(word, token)
+                continue
+            # each template is wrapped in a named group so the winning alternative is the lastgroup
+            alternatives.append("(?P<T%d>%s)" % (i, self.tokenTypes[token]))
+        # anything that is not whitespace and matches no template is unmatched
+        alternatives.append(r"(?P<UNMATCHED>\S)")
+        return re.compile(r"\s*(?:%s)" % "|".join(alternatives))
+
+    # find the first lower priority template that matches every word of a keyword template (ie. IDENTIFIER)
+    # returns None if the template is not a keyword or if another template would claim one of its words first
+    def get_keyword_host(self, ndx):
+        keyword = KEYWORD_TEMPLATE.fullmatch(self.tokenTypes[self.token_names[ndx]])
+        if not keyword:
+            return
+        words = keyword.group(1).split("|")
+        for i in range(ndx + 1, len(self.token_names)):
+            template = self.tokenTypes[self.token_names[i]]
+            if not KEYWORD_TEMPLATE.fullmatch(template) and all(re.fullmatch(template, x) for x in words):
+                return i
+            elif any(re.match(template, x) for x in words):
+                return
 
     def lex(self, code):
-        phrases = {}
+        return list(self.tokens(code))
+
+    # lex code one token at a time (tokens are only produced when they are asked for)
+    def tokens(self, code):
+        # line index of the original source for errors (clearing comments does not change offsets)
+        source = er.Source(code)
         # removes comments and whitespace
         code = self.clear_comments(code)
-        er.code = code
-        # checks for all direct matches
-        for token in self.tokenTypes:
-            matches = re.finditer(re.compile(self.tokenTypes[token]), code)
-            for match in matches:
-                # checks to make sure all char literals are valid
-                if token == "CHAR_LITERAL":
-                    self.check_char(match.group(0)[1:len(match.group(0)) - 1], match.start())
-                if match.group(0) != "" and match.start() not in phrases.keys():
-                    phrases[match.start()] = Token(token, match.group(0), match.start())
-                    code = re.sub(self.tokenTypes[token], " " * len(match.group(0)), code, 1)
-        # sorts them in order
-        numbers = [x for x in phrases]
-        numbers.sort()
-        phrase_list = [phrases[x] for x in numbers]
-        self.check_unmatched(code)
-        return phrase_list
+        # single left to right pass over the source
+        for match in self.master.finditer(code):
+            group = match.lastgroup
+            value, ndx = match.group(group), match.start(group)
+            # nothing in the token set could match
+            if group == "UNMATCHED":
+                er.throw("lex_error", "Invalid identifier name", [value, ndx])
+                continue
+            token = self.token_names[int(group[1:])]
+            # check if the match is actually a keyword
+            if group in self.keywords and value in self.keywords[group]:
+                if WORD_BOUNDARY.match(code, ndx) and WORD_BOUNDARY.match(code, match.end()):
+                    token = self.keywords[group][value]
+            # checks to make sure all char literals are valid
+            elif token == "CHAR_LITERAL":
+                self.check_char(value[1:len(value) - 1], ndx)
+            yield Token(token, value, ndx, source)
 
     @staticmethod
     def clear_comments(code):
-        # removes all multi-line comments
-        multi_line_comments = re.findall(re.compile("/\*.*\*/", re.MULTILINE | re.DOTALL), code)
-        for item in multi_line_comments:
-            lines = item.split("\n")
-            for line in range(len(lines)):
-                lines[line] = " " * len(lines[line])
-            new_comment = "\n".join(lines)
-            code = code.replace(item, new_comment, 1)
-        single_line_comments = re.findall(re.compile("//.*\n*"), code)
-        for item in single_line_comments:
-            code = code.replace(item, "\n" + (" " * (len(item) - 2)) + "\n", 1)
-        return code
+        # removes all multi-line comments (keeping new lines in place)
+        code = re.sub(re.compile("/\*.*\*/", re.MULTILINE | re.DOTALL), lambda m: re.sub("[^\n]", " ", m.group(0)), code)
+        # removes all single line comments (keeping the length of the source the same)
+        return re.sub(re.compile("//.*\n*"), lambda m: "\n" + (" " * (len(m.group(0)) - 2)) + "\n", code)
 
     # check to make sure contents of char code are valid
     @staticmethod
@@ -57,13 +106,3 @@ class Lexer:
         if len(char) > 1:
             if char not in slash_chars:
                 er.throw("lex_error", "Invalid char literal", [char, ndx])
-
-    # finds all unmatched tokens and throws them as an error
-    @staticmethod
-    def check_unmatched(code_str):
-        unmatched = re.finditer(r"[^\s]", code_str)
-        for item in unmatched:
-            er.throw("lex_error", "Invalid identifier name", [item.group(0), item.start()])
-
-
-
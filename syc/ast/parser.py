@@ -1,14 +1,73 @@
+import json
+
 import syc.ast.grammar as gramtools
 
 import errormodule as er
+import util
 from syc.ast.ast import ASTNode
 from syc.ast.ast import Token
 
+# version of the cached parse table (increment whenever table generation changes)
+TABLE_VERSION = 3
+
+# parse table and grammar shared by all parsers in the process (loaded on first parse)
+_parse_table = None
+
+# compiled form of the shared parse table
+_compiled_table = None
+
+# stack symbol used to close the AST node of a nonterminal in compiled mode
+QUEUE = -1
+
+
+# parse table with all symbols interned to integers
+# terminals are numbered from 0, the column after them is used for token types the grammar never uses
+# and nonterminals are numbered after that column so any symbol >= nt_base is a nonterminal
+class CompiledTable:
+    def __init__(self, table, grammar):
+        self.terminals = [x for x in grammar.terminals if x != "$"] + ["$"]
+        self.terminal_ids = {x: i for i, x in enumerate(self.terminals)}
+        self.end = self.terminal_ids["$"]
+        self.unknown = len(self.terminals)
+        # row width of the dense table
+        self.width = len(self.terminals) + 1
+        self.nonterminals = grammar.nonterminals
+        self.nt_base = self.width
+        self.start_symbol = self.nt_base + self.nonterminals.index(grammar.start_symbol)
+        # dense table indexed by nonterminal id * width + terminal id
+        # entries are the symbols to push (already reversed), () for epsilon or None for no entry
+        self.entries = [None] * (len(self.nonterminals) * self.width)
+        # expected token types for each nonterminal (used for errors)
+        self.expected = []
+        nonterminal_ids = {x: self.nt_base + i for i, x in enumerate(self.nonterminals)}
+        for i, nt in enumerate(self.nonterminals):
+            self.expected.append([str(x) for x in table[nt].keys()])
+            for terminal, production in table[nt].items():
+                symbols = [nonterminal_ids[x] if x in nonterminal_ids else self.terminal_ids[x] for x in production if x != "&"]
+                # epsilon productions never add anything to the AST
+                self.entries[i * self.width + self.terminal_ids[terminal]] = (QUEUE, *reversed(symbols)) if symbols else ()
+
 
 class Parser:
+    # the input can be any iterable of tokens (the streaming parser reads it lazily)
     def __init__(self, input_buffer):
         self.input_buffer = input_buffer
-        self.follow_table = {}
+        # number of tokens read by the streaming parser (not counting the end token)
+        self.token_count = 0
+
+    # get the input as a list (the table parsers index it and add the end token to it)
+    def buffer_input(self):
+        if not isinstance(self.input_buffer, list):
+            self.input_buffer = list(self.input_buffer)
+        return self.input_buffer
+
+    # token marking the end of the input (placed at the last token)
+    @staticmethod
+    def end_token(last):
+        if last:
+            return Token("$", "$", last.ndx, last.source)
+        # empty sources have no tokens to take a position from
+        return Token("$", "$", 0, er.Source(""))
 
     # main parsing method
     def run_parser(self, table, grammar):
@@ -19,7 +78,7 @@ class Parser:
         stack = ["$", grammar.start_symbol]
         # stack for holding building AST
         sem_stack = [ASTNode(grammar.start_symbol)]
-        self.input_buffer.append(Token("$", "$", self.input_buffer[-1].ndx))
+        self.buffer_input().append(self.end_token(self.input_buffer[-1] if self.input_buffer else None))
         # enter cycle
         while len(stack) > 0:
             if stack[len(stack) - 1] == "queue":
@@ -55,137 +114,173 @@ class Parser:
                 pos += 1
         return sem_stack[0]
 
-    # generates the parsing table
-    def generate_table(self, grammar):
-        # primes p table
-        parsing_table = {}
-        # iterates through productions getting firsts and follows and assembling parsing table
-        for production in grammar.productions:
-            # adds a new entry for the nt productions
-            parsing_table[production] = {}
-            # checks through each sub-production for the main production
-            for sub_pro in grammar.productions[production]:
-                # gets first
-                first = self.first(grammar=grammar, production=[sub_pro])
-                # if there is an epsilon, gets follows
-                for item in first:
-                    if item == "&":
-                        follow = self.follow(production, grammar)
-                        for f in follow:
-                            if f in parsing_table[production]:
-                                print(f)
-                                print(production)
-                            parsing_table[production][f] = sub_pro
-                    else:
-                        parsing_table[production][item] = sub_pro
-        return parsing_table
-
-    # follow function
-    def follow(self, symbol, grammar):
-
-        if symbol in self.follow_table.keys():
-            return self.follow_table[symbol]
-        # sets up follow set
-        follow_set = []
-
-        # avoids repeat chars
-        def add_to_follow_set(char):
-            if char not in follow_set:
-                follow_set.append(char)
-
-        # adds $ for start symbol
-        if symbol == grammar.start_symbol:
-            add_to_follow_set("$")
-        # iterates through each production and then each sub-production
-        for name in grammar.productions:
-            production = grammar.productions[name]
-            for subPro in production:
-                # checks if the given symbol is the sub-productions
-                if symbol in subPro:
-                    # finds its location
-                    ndx = subPro.index(symbol)
-                    # each evaluates a follow pattern
-                    if ndx >= len(subPro) - 1 and symbol != name:
-                        follow = self.follow(name, grammar)
-                        for item in follow:
-                            add_to_follow_set(item)
-                    elif ndx < len(subPro) - 1:
-                        follows = self.evaluate_follow(grammar, subPro, ndx, name, symbol)
-                        for item in follows:
-                            add_to_follow_set(item)
-        self.follow_table[symbol] = follow_set
-        return follow_set
-
-    # evaluate standard follow
-    def evaluate_follow(self, grammar, subPro, ndx, name, symbol):
-        # sets up follow set
-        follow_set = []
-
-        # avoids repeat chars
-        def add_to_follow_set(char):
-            if char not in follow_set:
-                follow_set.append(char)
-
-        follows = self.first(grammar, [subPro[ndx + 1:]])
-        for follow in follows:
-            if follow != "&":
-                add_to_follow_set(follow)
+    # parsing method using a compiled table (same output as run_parser)
+    def run_compiled_parser(self, table):
+        self.buffer_input().append(self.end_token(self.input_buffer[-1] if self.input_buffer else None))
+        # intern the input token types
+        terminal_ids, unknown = table.terminal_ids, table.unknown
+        input_ids = [terminal_ids.get(x.type, unknown) for x in self.input_buffer]
+        entries, width, nt_base, nonterminals = table.entries, table.width, table.nt_base, table.nonterminals
+        # position in input
+        pos = 0
+        # stack declaration
+        stack = [table.end, table.start_symbol]
+        # stack for holding building AST
+        sem_stack = [ASTNode(nonterminals[table.start_symbol - nt_base])]
+        while stack:
+            symbol = stack.pop()
+            # handles non terminals
+            if symbol >= nt_base:
+                entry = entries[(symbol - nt_base) * width + input_ids[pos]]
+                if entry is None:
+                    er.throw("syntax_error", "Unexpected Token", [self.input_buffer[pos], table.expected[symbol - nt_base]])
+                # epsilon productions produce no AST
+                if entry:
+                    sem_stack.append(ASTNode(nonterminals[symbol - nt_base]))
+                    stack.extend(entry)
+            # handles closing of ASTs (ignoring empty ASTs)
+            elif symbol == QUEUE:
+                node = sem_stack.pop()
+                if node.content:
+                    sem_stack[-1].content.append(node)
+            # handles terminals
             else:
-                if ndx + 2 < len(subPro) - 1:
-                    follows2 = self.evaluate_follow(grammar, subPro[ndx + 2:], ndx, name, symbol)
-                    for follow2 in follows2:
-                        add_to_follow_set(follow2)
+                if symbol == input_ids[pos]:
+                    if symbol != table.end:
+                        sem_stack[-1].content.append(self.input_buffer[pos])
                 else:
-                    follows3 = self.follow(name, grammar)
-                    for follow3 in follows3:
-                        add_to_follow_set(follow3)
-        return follow_set
-
-    # first function
-    def first(self, grammar, production):
-        # primes first list
-        first_list = []
-
-        # sets up add to first list function to make processing easier
-        def add_to_first_list(obj):
-            if isinstance(obj, list):
-                for item in obj:
-                    if item not in first_list:
-                        first_list.append(item)
-            else:
-                if obj not in first_list:
-                    first_list.append(obj)
-        # iterate through productions
-        for sub_pro in production:
-            # if first item is a terminal, add to first list
-            if sub_pro[0] in grammar.terminals or sub_pro[0] == "&":
-                add_to_first_list(sub_pro[0])
-            # if first item in non-terminal, recur and add the result to first list
-            else:
-                add_to_first_list(self.non_terminal_first(grammar, sub_pro, 0))
-        return first_list
-        
-    # handles non_terminals in first
-    def non_terminal_first(self, grammar, production, pos):
-        firsts = []
-        first = self.first(grammar, grammar.productions[production[pos]])
-        for item in first:
-            if item != "&":
-                firsts.append(item)
+                    er.throw("syntax_error", "Unexpected Token", [self.input_buffer[pos], table.terminals[symbol]])
+                pos += 1
+        return sem_stack[0]
+
+    # parsing method reading tokens one at a time from any iterable (same output as run_compiled_parser)
+    # only the current token is held, so the input (ie. Lexer.tokens) never has to be materialized
+    def run_streaming_parser(self, table):
+        tokens = iter(self.input_buffer)
+        terminal_ids, unknown = table.terminal_ids, table.unknown
+        entries, width, nt_base, nonterminals = table.entries, table.width, table.nt_base, table.nonterminals
+        self.token_count = 0
+        # current token and its interned type
+        token = next(tokens, None)
+        if token:
+            self.token_count += 1
+        else:
+            token = self.end_token(None)
+        token_id = terminal_ids.get(token.type, unknown)
+        # stack declaration
+        stack = [table.end, table.start_symbol]
+        # stack for holding building AST
+        sem_stack = [ASTNode(nonterminals[table.start_symbol - nt_base])]
+        while stack:
+            symbol = stack.pop()
+            # handles non terminals
+            if symbol >= nt_base:
+                entry = entries[(symbol - nt_base) * width + token_id]
+                if entry is None:
+                    er.throw("syntax_error", "Unexpected Token", [token, table.expected[symbol - nt_base]])
+                # epsilon productions produce no AST
+                if entry:
+                    sem_stack.append(ASTNode(nonterminals[symbol - nt_base]))
+                    stack.extend(entry)
+            # handles closing of ASTs (ignoring empty ASTs)
+            elif symbol == QUEUE:
+                node = sem_stack.pop()
+                if node.content:
+                    sem_stack[-1].content.append(node)
+            # handles terminals
             else:
-                if len(production) - 1 >= pos + 1:
-                    if production[pos + 1] in grammar.nonterminals:
-                        firsts += self.non_terminal_first(grammar, production, pos + 1)
-                    else:
-                        firsts.append(production[pos + 1])
+                if symbol != token_id:
+                    er.throw("syntax_error", "Unexpected Token", [token, table.terminals[symbol]])
+                if symbol == table.end:
+                    continue
+                sem_stack[-1].content.append(token)
+                # move to the next token (the end token once the input runs out)
+                next_token = next(tokens, None)
+                if next_token:
+                    self.token_count += 1
+                    token = next_token
                 else:
-                    firsts.append(item)
-        return firsts
+                    token = self.end_token(token)
+                token_id = terminal_ids.get(token.type, unknown)
+        return sem_stack[0]
 
     def parse(self):
-        # loads in the grammar
-        g = gramtools.build_grammar()
-        # generate parsing table
-        p_table = self.generate_table(g)
-        # returns result of parsing function
-        return self.run_parser(p_table, g)
+        # returns result of the streaming parsing function
+        return self.run_streaming_parser(get_compiled_table())
+
+
+# generates the parsing table and the list of LL(1) conflicts found in the grammar
+def generate_table(grammar):
+    nullable = gramtools.nullable_set(grammar)
+    first = gramtools.first_sets(grammar, nullable)
+    follow = gramtools.follow_sets(grammar, first, nullable)
+    # entries of each row are added in the order the grammar is walked (the order of the expected tokens of errors)
+    orders = gramtools.lookahead_orders(grammar)
+    # terminal order used for anything the walk did not reach
+    order = {x: i for i, x in enumerate(grammar.terminals + ["$"])}
+    parsing_table = {}
+    conflicts = []
+    for name in grammar.productions:
+        parsing_table[name] = {}
+        for production, production_order in zip(grammar.productions[name], orders[name]):
+            lookaheads = gramtools.first_of(production, first, nullable)
+            # if the production is nullable, it is also selected by everything that can follow the nonterminal
+            if "&" in lookaheads:
+                lookaheads.remove("&")
+                lookaheads |= follow[name]
+            rank = {x: i for i, x in enumerate(production_order)}
+            for terminal in sorted(lookaheads, key=lambda x: (rank.get(x, len(rank)), order[x])):
+                if terminal in parsing_table[name] and parsing_table[name][terminal] != production:
+                    conflicts.append(gramtools.Conflict(name, terminal, [parsing_table[name][terminal], production]))
+                parsing_table[name][terminal] = production
+    return parsing_table, conflicts
+
+
+# get the parse table and grammar, only loading them once per process
+def get_parse_table():
+    global _parse_table
+    if not _parse_table:
+        _parse_table = load_parse_table()
+    return _parse_table
+
+
+# get the compiled form of the shared parse table
+def get_compiled_table():
+    global _compiled_table
+    if not _compiled_table:
+        _compiled_table = CompiledTable(*get_parse_table())
+    return _compiled_table
+
+
+# load the parse table from the disk cache or generate and cache it if it is missing or out of date
+def load_parse_table():
+    # cache is keyed by the contents of the grammar file
+    grammar_hash = gramtools.grammar_hash()
+    cache_path = util.CACHE_DIR + '/parse_table.json'
+    try:
+        with open(cache_path) as file:
+            cache = json.load(file)
+        if cache['version'] == TABLE_VERSION and cache['hash'] == grammar_hash:
+            # rebuild the grammar from the cache
+            grammar = gramtools.Grammar()
+            grammar.terminals = cache['terminals']
+            grammar.nonterminals = cache['nonterminals']
+            grammar.productions = cache['productions']
+            grammar.start_symbol = cache['start_symbol']
+            return cache['table'], grammar
+    # missing or corrupt caches are just regenerated
+    except (OSError, ValueError, KeyError):
+        pass
+    grammar = gramtools.build_grammar()
+    table, _ = generate_table(grammar)
+    cache = {
+        'version': TABLE_VERSION,
+        'hash': grammar_hash,
+        'terminals': grammar.terminals,
+        'nonterminals': grammar.nonterminals,
+        'productions': grammar.productions,
+        'start_symbol': grammar.start_symbol,
+        'table': table
+    }
+    util.write_cache(cache_path, json.dumps(cache))
+    return table, grammar
@@ -4,6 +4,9 @@
 # branch nodes that make up expressions in Action Tree
 # similar to AST Nodes
 class ExprNode:
+    # nodes are slotted as action trees are kept alive until the end of compilation
+    __slots__ = ('name', 'arguments', 'data_type')
+
     # func = str (name of function / operation)
     # args = list[sub trees / arguments] (can be Literals, Identifiers or other Action Nodes)
     def __init__(self, func, rt_type, *args):
@@ -13,11 +16,13 @@ class ExprNode:
         self.data_type = rt_type
 
     def __str__(self):
-        return '(%s, %s){%s}' % (self.name, self.data_type, ', '.join(map(lambda x: str(x), self.arguments)))
+        return '(%s, %s){%s}' % (self.name, self.data_type, ', '.join(str(x) for x in self.arguments))
 
 
 # single nodes used to represent statements in Action Tree, like ExprNodes, but without return type
 class StatementNode:
+    __slots__ = ('statement', 'arguments')
+
     # statement = type of statement
     # args = arguments / components of statement
     def __init__(self, stmt, *args):
@@ -25,11 +30,13 @@ class StatementNode:
         self.arguments = [*args]
 
     def __str__(self):
-        return self.statement + ' {%s}\n' % ', '.join(map(lambda x: str(x), self.arguments))
+        return self.statement + ' {%s}\n' % ', '.join(str(x) for x in self.arguments)
 
 
 # class representing literal value
 class Literal:
+    __slots__ = ('data_type', 'value')
+
     # data_type = DataType
     # val = literal value (as literal object)
     def __init__(self, data_type, val):
@@ -42,8 +49,12 @@ class Literal:
 
 # class representing in-expr identifier
 class Identifier:
-    def __init__(self, name, data_type, constant, constexpr=False):
+    __slots__ = ('name', 'data_type', 'constant', 'constexpr', 'value')
+
+    def __init__(self, name, data_type, constant, constexpr=False, value=None):
         self.name = name
         self.data_type = data_type
         self.constant = constant
         self.constexpr = constexpr
+        # initializer of constants (used to propagate their values)
+        self.value = value
@@ -0,0 +1,160 @@
+from array import array
+
+from syc.icg.action_tree import ExprNode, StatementNode, Literal, Identifier
+
+# flat action tree representation
+# every node is a row of parallel integer arrays, node arguments are ranges of an operand array
+# strings, data types and literal values are stored once in side tables and referred to by index
+
+# node kinds
+EXPR = 0
+STATEMENT = 1
+LITERAL = 2
+IDENTIFIER = 3
+# plain list of arguments (parameter lists, ect.)
+LIST = 4
+# any other argument (counts, symbols, ect.), stored as is
+VALUE = 5
+
+# identifier flags
+CONSTANT = 1
+CONSTEXPR = 2
+
+
+class ActionArena:
+    def __init__(self):
+        # kind of each node
+        self.kinds = array('b')
+        # name (expressions, statements, identifiers) or value (literals, values) of each node (index into strings / values)
+        self.names = array('i')
+        # data type of each node (index into type_table, -1 for none)
+        self.types = array('i')
+        # position of the first argument of each node in operands
+        self.first = array('i')
+        # number of arguments of each node
+        self.counts = array('i')
+        # identifier flags of each node
+        self.flags = array('b')
+        # node indices of all arguments
+        self.operands = array('i')
+        # side tables
+        self.strings = []
+        self.type_table = []
+        self.values = []
+        # indices of strings and types already in the side tables
+        self.string_ndx = {}
+        self.type_ndx = {}
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def add_string(self, string):
+        if string not in self.string_ndx:
+            self.string_ndx[string] = len(self.strings)
+            self.strings.append(string)
+        return self.string_ndx[string]
+
+    # types are indexed by identity as not all data types can be hashed
+    def add_type(self, dt):
+        if dt is None:
+            return -1
+        if id(dt) not in self.type_ndx:
+            self.type_ndx[id(dt)] = len(self.type_table)
+            self.type_table.append(dt)
+        return self.type_ndx[id(dt)]
+
+    def add_value(self, value):
+        self.values.append(value)
+        return len(self.values) - 1
+
+    # add a node with no arguments yet (returns its index)
+    def add_node(self, kind, name, dt, flags=0):
+        self.kinds.append(kind)
+        self.names.append(name)
+        self.types.append(dt)
+        self.first.append(0)
+        self.counts.append(0)
+        self.flags.append(flags)
+        return len(self.kinds) - 1
+
+    # set the arguments of a node
+    def set_arguments(self, node, arguments):
+        self.first[node] = len(self.operands)
+        self.counts[node] = len(arguments)
+        self.operands.extend(arguments)
+
+    # get the node indices of the arguments of a node
+    def arguments(self, node):
+        return self.operands[self.first[node]:self.first[node] + self.counts[node]]
+
+    def data_type(self, node):
+        return self.type_table[self.types[node]] if self.types[node] != -1 else None
+
+    def name(self, node):
+        return self.strings[self.names[node]]
+
+
+# convert an action tree to an arena (the root of the tree is node 0)
+def to_arena(tree):
+    arena = ActionArena()
+    # pending items [item, node index, converted argument indices]
+    stack = []
+
+    # add an item, returns its node and the arguments that still have to be added (None if it has none)
+    def add(item):
+        if isinstance(item, ExprNode):
+            return arena.add_node(EXPR, arena.add_string(item.name), arena.add_type(item.data_type)), item.arguments
+        elif isinstance(item, StatementNode):
+            return arena.add_node(STATEMENT, arena.add_string(item.statement), -1), item.arguments
+        elif isinstance(item, list):
+            return arena.add_node(LIST, -1, -1), item
+        elif isinstance(item, Literal):
+            return arena.add_node(LITERAL, arena.add_value(item.value), arena.add_type(item.data_type)), None
+        elif isinstance(item, Identifier):
+            flags = (CONSTANT if item.constant else 0) | (CONSTEXPR if item.constexpr else 0)
+            node = arena.add_node(IDENTIFIER, arena.add_string(item.name), arena.add_type(item.data_type), flags)
+            # the initializer of constants is kept as a value argument (it is converted with its declaration)
+            if item.value is not None:
+                arena.set_arguments(node, [arena.add_node(VALUE, arena.add_value(item.value), -1)])
+            return node, None
+        return arena.add_node(VALUE, arena.add_value(item), -1), None
+
+    root, arguments = add(tree)
+    if arguments is not None:
+        stack.append([iter(arguments), root, []])
+    while stack:
+        frame = stack[-1]
+        item = next(frame[0], stack)
+        # all arguments have been added
+        if item is stack:
+            stack.pop()
+            arena.set_arguments(frame[1], frame[2])
+            continue
+        node, arguments = add(item)
+        frame[2].append(node)
+        if arguments is not None:
+            stack.append([iter(arguments), node, []])
+    return arena
+
+
+# convert an arena back to an action tree
+def from_arena(arena):
+    # nodes are converted after their arguments (arguments always have a higher index than their parent)
+    nodes = [None] * len(arena)
+    for node in reversed(range(len(arena))):
+        kind = arena.kinds[node]
+        if kind == EXPR:
+            nodes[node] = ExprNode(arena.name(node), arena.data_type(node), *[nodes[x] for x in arena.arguments(node)])
+        elif kind == STATEMENT:
+            nodes[node] = StatementNode(arena.name(node), *[nodes[x] for x in arena.arguments(node)])
+        elif kind == LIST:
+            nodes[node] = [nodes[x] for x in arena.arguments(node)]
+        elif kind == LITERAL:
+            nodes[node] = Literal(arena.data_type(node), arena.values[arena.names[node]])
+        elif kind == IDENTIFIER:
+            flags = arena.flags[node]
+            value = nodes[arena.operands[arena.first[node]]] if arena.counts[node] else None
+            nodes[node] = Identifier(arena.name(node), arena.data_type(node), bool(flags & CONSTANT), bool(flags & CONSTEXPR), value)
+        else:
+            nodes[node] = arena.values[arena.names[node]]
+    return nodes[0]
@@ -1,3 +1,6 @@
+import math
+import re
+
 import syc.icg.action_tree as action_tree
 import syc.icg.types as types
 import util
@@ -12,8 +15,8 @@ valid_nodes = {
     '+': lambda args: sum(args),
     '-': lambda args: aggregate(lambda a, b: a - b, args),
     '*': lambda args: aggregate(lambda a, b: a * b, args),
-    '/': lambda args: aggregate(lambda a, b: a / b, args),
-    '%': lambda args: aggregate(lambda a, b: a % b, args),
+    '/': lambda args: aggregate(divide, args),
+    '%': lambda args: aggregate(remainder, args),
     '^': lambda args: aggregate(lambda a, b: b ** a, list(reversed(args))),
     'ARshift': lambda args: args[0] >> args[1],
     'LRshift': lambda args: (args[0] % 0x100000000) >> args[1],
@@ -41,6 +44,21 @@ valid_nodes = {
 }
 
 
+# characters written as escape sequences in string and char literals (see Lexer.check_char)
+escapes = {'n': '\n', 't': '\t', 'r': '\r', '\\': '\\', '\'': '\'', '"': '"'}
+escaped = {escapes[x]: '\\' + x for x in escapes}
+
+
+# get the characters of the contents of a string or char literal
+def unescape(text):
+    return re.sub(r'\\(.)', lambda m: escapes.get(m.group(1), m.group(1)), text, flags=re.DOTALL)
+
+
+# get the contents of a string or char literal holding text
+def escape(text):
+    return ''.join(escaped.get(x, x) for x in text)
+
+
 # used to apply aggregation based actions to a set of items
 # assume len(c) is at least 2
 def aggregate(func, c):
@@ -50,6 +68,21 @@ def aggregate(func, c):
     return aggr
 
 
+# divide two values (integer division truncates toward zero like sdiv, python floors it)
+def divide(a, b):
+    if type(a) == int and type(b) == int:
+        quotient = abs(a) // abs(b)
+        return quotient if (a < 0) == (b < 0) else -quotient
+    return a / b
+
+
+# get the remainder of two values (it takes the sign of the dividend like srem and frem, python gives it the sign of the divisor)
+def remainder(a, b):
+    if type(a) == int and type(b) == int:
+        return a - b * divide(a, b)
+    return math.fmod(a, b)
+
+
 # used to compare both type and value
 def type_compare(a, b):
     return a == b and type(a) == type(b)
@@ -81,6 +114,62 @@ def check(expr):
     return True
 
 
+# evaluate an expression node whose arguments are all literals
+# returns the resulting Literal or None if it can not be evaluated at compile-time
+def fold(expr):
+    if expr.name not in valid_nodes:
+        return
+    args = []
+    for arg in expr.arguments:
+        if not isinstance(arg, action_tree.Literal):
+            return
+        value = literal_value(arg)
+        if value is None:
+            return
+        args.append(value)
+    try:
+        value = valid_nodes[expr.name](args)
+    # errors are left to be handled at runtime
+    except (ArithmeticError, TypeError, ValueError, IndexError, KeyError):
+        return
+    return make_literal(value, expr.data_type)
+
+
+# get the value of a Literal (None if it has no compile-time value)
+def literal_value(literal):
+    return _extract_literal(literal)
+
+
+# range of the values of each integral data type (min, max)
+integer_ranges = {
+    types.DataTypes.INT: (-2 ** 31, 2 ** 31 - 1),
+    types.DataTypes.LONG: (-2 ** 63, 2 ** 63 - 1)
+}
+
+
+# create a Literal of a simple data type from a value (None if the value does not fit the data type)
+def make_literal(value, dt):
+    if not isinstance(dt, types.DataType) or dt.pointers != 0:
+        return
+    # check bool first as bools are ints
+    if type(value) == bool:
+        if dt.data_type == types.DataTypes.BOOL:
+            return action_tree.Literal(dt, 'true' if value else 'false')
+    elif dt.data_type in integer_ranges:
+        # values out of range are left to overflow at runtime
+        if type(value) == int and integer_ranges[dt.data_type][0] <= value <= integer_ranges[dt.data_type][1]:
+            return action_tree.Literal(dt, str(value))
+    elif dt.data_type == types.DataTypes.FLOAT:
+        if type(value) in {int, float} and math.isfinite(value):
+            return action_tree.Literal(dt, repr(float(value)))
+    elif dt.data_type == types.DataTypes.STRING:
+        if type(value) == str:
+            return action_tree.Literal(dt, '"%s"' % escape(value))
+    elif dt.data_type == types.DataTypes.CHAR:
+        if type(value) == str and len(value) == 1:
+            return action_tree.Literal(dt, '\'%s\'' % escape(value))
+
+
 # extract value and check expression
 def get_array_bound(expr):
     # run initial check on expression
@@ -134,7 +223,7 @@ def _extract_literal(literal):
             return float(literal.value)
         # if string
         elif dt in {types.DataTypes.STRING, types.DataTypes.CHAR}:
-            return literal.value[1:-1]
+            return unescape(literal.value[1:-1])
         # if boolean
         elif dt == types.DataTypes.BOOL:
             return literal.value == 'true'
@@ -147,9 +236,8 @@ def _extract_literal(literal):
         lst = []
         # convert list of expressions to list of values
         for item in literal.value:
-            valid_item = check(item)
             # check for invalid items
-            if not valid_item and valid_item != 0:
+            if not check(item):
                 return
             # append extracted item
             lst.append(_extract_value(item))
@@ -161,9 +249,8 @@ def _extract_literal(literal):
         dct = {}
         # convert dictionary of expressions to dictionary of values
         for k, v in literal.value.items():
-            valid_k, valid_v = check(k), check(v)
             # check for invalid items
-            if not valid_k and valid_k != 0 or not valid_v and valid_v != 0:
+            if not check(k) or not check(v):
                 return
             # add value to dictionary
             dct[_extract_value(k)] = _extract_value(v)
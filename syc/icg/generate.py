@@ -1,31 +1,54 @@
 from syc.icg.table import SymbolTable
 from syc.ast.ast import ASTNode
 import util
-from syc.icg.generators.stmt import generate_statement, Context
 
+# generated packages by the id of their ast (ast, IR Object)
+# packages included in more than one place are only generated once
+packages = {}
 
+
+# generate the action tree of an ast (returns the generated statements in order)
 def generate_tree(ast):
+    # the statement generators (and the expression compiler behind them) are loaded on first use
+    from syc.icg.generators.stmt import generate_statement, Context
     if not util.symbol_table:
         util.symbol_table = SymbolTable()
+    action_tree = []
     for item in ast.content:
         if isinstance(item, ASTNode):
-            # test code for expr compiler
             if item.name == 'stmt':
                 try:
-                    print(generate_statement(item.content[0], Context(False, False, False)))
+                    statement = generate_statement(item.content[0], Context(False, False, False))
+                    # test code for expr compiler
+                    print(statement)
+                    action_tree.append(statement)
                 except util.SyCloneRecoverableError as e:
                     print(str(e) + '\n')
             else:
-                generate_tree(item)
+                action_tree.extend(generate_tree(item))
         elif isinstance(item, util.Package):
-            # store working table to restore after completion
-            local_table = util.symbol_table
-            # generate new package element
-            local_tree = generate_tree(item.content)
-            # create new package content object
-            # util.symbol_table being the package's working table
-            item.content = type('Object', (), dict(symbol_table=util.symbol_table, action_tree=local_tree))
-            # reset symbol table
-            util.symbol_table = local_table
+            # packages loaded from their interface are already generated
+            if isinstance(item.content, ASTNode):
+                item.content = generate_package(item.content)
             util.symbol_table.add_package(item)
-    return ast
+    return action_tree
+
+
+# generate a package in its own symbol table (returns the IR Object of the package)
+def generate_package(package_ast):
+    if id(package_ast) in packages:
+        return packages[id(package_ast)][1]
+    # store working table to restore after completion
+    local_table = util.symbol_table
+    # generate new package element in its own table
+    util.symbol_table = SymbolTable()
+    local_tree = generate_tree(package_ast)
+    # index the package's exports once so including it does not search its table
+    util.symbol_table.build_exports()
+    # create new package content object
+    # util.symbol_table being the package's working table
+    content = type('Object', (), dict(symbol_table=util.symbol_table, action_tree=local_tree))
+    packages[id(package_ast)] = (package_ast, content)
+    # reset symbol table
+    util.symbol_table = local_table
+    return content
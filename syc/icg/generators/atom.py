@@ -5,6 +5,7 @@ from syc.ast.ast import ASTNode, Token, unparse
 import util
 from syc.icg.action_tree import ExprNode, Identifier, Literal
 import syc.icg.types as types
+import syc.icg.relations as relations
 import syc.icg.generators.functions as functions
 from syc.icg.generators.data_types import generate_type
 from copy import copy
@@ -77,17 +78,16 @@ def generate_atom(atom):
             # if instance type is a custom Type or normal data type
             if new and isinstance(base.data_type, types.CustomType) | isinstance(base.data_type, types.DataType):
                 # if it is not a structure of a group
-                if base.data_type not in [types.DataType(types.DataTypes.STRUCT, 0), types.DataType(types.DataTypes.MODULE, 0)]:
+                if base.data_type not in [types.data_type(types.DataTypes.STRUCT), types.data_type(types.DataTypes.MODULE)]:
                     # if it is a data type
                     if isinstance(base.data_type, types.DataTypeLiteral):
                         # get new pointer type
-                        dt = copy(base.data_type)
-                        dt.pointers += 1
+                        dt = types.pointer(base.data_type)
                         # return memory allocation with size of type
-                        base = ExprNode('Malloc', dt, ExprNode('SizeOf', types.DataType(types.DataTypes.INT, 1), base))
+                        base = ExprNode('Malloc', dt, ExprNode('SizeOf', types.data_type(types.DataTypes.INT, 1), base))
                     else:
                         # if it is not an integer
-                        if base.data_type != types.DataType(types.DataTypes.INT, 0):
+                        if base.data_type != types.data_type(types.DataTypes.INT):
                             # all tests failed, not allocatable
                             errormodule.throw('semantic_error', 'Unable to dynamically allocate memory for object', atom)
                         else:
@@ -200,21 +200,23 @@ def add_call_trailer(root, trailer):
             # check for interface type cast (assume obj is custom type)
             if isinstance(tp, types.CustomType) and tp.data_type == types.DataTypes.INTERFACE and obj.data_type.data_type != tp.data_type:
                 ndt = copy(obj.data_type)
-                ndt.interfaces.append(tp.name)
+                # the copy shares its interfaces with the original
+                ndt.interfaces = ndt.interfaces + [tp.name]
                 ndt.update_interface_overloads()
                 return ExprNode('TypeCast', ndt, root, obj)
             return ExprNode('TypeCast', tp, root, obj)
         # use raw type based cast
         else:
             # if dynamic cast fails
-            if not casting.dynamic_cast(root.data_type.data_type, obj.data_type):
+            if not relations.cast(root.data_type.data_type, obj.data_type):
                 errormodule.throw('semantic_error', 'Invalid type cast', trailer)
             else:
                 # check for interface type cast (assume obj is custom type)
                 if isinstance(root.data_type, types.CustomType) and root.data_type.data_type == types.DataTypes.INTERFACE and \
                                 obj.data_type.data_type != root.data_type.data_type:
                     ndt = copy(obj.data_type)
-                    ndt.interfaces.append(root.data_type.name)
+                    # the copy shares its interfaces with the original
+                    ndt.interfaces = ndt.interfaces + [root.data_type.name]
                     ndt.update_interface_overloads()
                     return ExprNode('TypeCast', ndt, root, obj)
                 return ExprNode('TypeCast', root.data_type.data_type, root, obj)
@@ -295,7 +297,7 @@ def add_subscript_trailer(root, trailer):
                         return ExprNode('Call', slice_method.data_type.return_type, slice_method, expr, expr2, step)
                 # string slicing
                 elif isinstance(root.data_type, types.DataType) and root.data_type.data_type == types.DataTypes.STRING:
-                    return ExprNode('Slice', types.DataType(types.DataTypes.CHAR, 0), root, expr, expr2, step)
+                    return ExprNode('Slice', types.data_type(types.DataTypes.CHAR), root, expr, expr2, step)
                 errormodule.throw('semantic_error', 'Unable to perform slice on non slice-able object', trailer)
             return ExprNode('Slice', root.data_type, root, expr, expr2, step)
         # check slice till end
@@ -320,7 +322,7 @@ def add_subscript_trailer(root, trailer):
             expr = generate_expr(trailer.content[1].content[0])
             # if not dict, use element type, not value type
             if isinstance(root.data_type, types.MapType):
-                if expr.data_type != root.data_type.key_type and not types.coerce(root.data_type.key_type, expr.data_type):
+                if expr.data_type != root.data_type.key_type and not relations.coerce(root.data_type.key_type, expr.data_type):
                     errormodule.throw('semantic_error',
                                       'Type of subscript on dictionary must match data type of dictionary', trailer)
                 dt = root.data_type.value_type
@@ -331,7 +333,7 @@ def add_subscript_trailer(root, trailer):
                 dt = None
             return ExprNode('Subscript', dt, expr, root)
         # if it is a module
-        elif isinstance(root.data_type, types.CustomType) and root.data_type.data_type == types.DataType(types.DataTypes.MODULE, 0):
+        elif isinstance(root.data_type, types.CustomType) and root.data_type.data_type == types.data_type(types.DataTypes.MODULE):
             # if it has subscript method
             subscript_method = modules.get_property(root.data_type, '__subscript__')
             if subscript_method:
@@ -342,10 +344,10 @@ def add_subscript_trailer(root, trailer):
             else:
                 errormodule.throw('semantic_error', 'Object has no method \'__subscript__\'', trailer)
         # strings members can be subscripted, but they cannot modified
-        elif root.data_type == types.DataType(types.DataTypes.STRING, 0):
+        elif root.data_type == types.data_type(types.DataTypes.STRING):
             expr = generate_expr(trailer.content[1])
             if isinstance(expr.data_type, types.DataType) and expr.data_type.data_type == types.DataTypes.INT:
-                return ExprNode('Subscript', types.DataType(types.DataTypes.CHAR, 0), expr, root)
+                return ExprNode('Subscript', types.data_type(types.DataTypes.CHAR), expr, root)
             else:
                 errormodule.throw('semantic_error', 'Strings can only be subscripted using integers', trailer)
         else:
@@ -354,6 +356,8 @@ def add_subscript_trailer(root, trailer):
 
 # add get member '.' trailer
 def add_get_member_trailer(root, trailer):
+    # the member is parsed as a base holding its identifier
+    member_name = trailer.content[1].content[0].value if isinstance(trailer.content[1], ASTNode) else trailer.content[1].value
     # if it is a custom type
     if isinstance(root.data_type, types.CustomType):
         # interface members cannot be accessed
@@ -362,15 +366,15 @@ def add_get_member_trailer(root, trailer):
         # use module method if necessary
         elif root.data_type.data_type == types.DataTypes.MODULE:
             if root.data_type.instance:
-                prop = modules.get_property(root.data_type, trailer.content[1].value)
+                prop = modules.get_property(root.data_type, member_name)
             else:
-                prop = modules.get_static_member(root.data_type, trailer.content[1].value)
+                prop = modules.get_static_member(root.data_type, member_name)
             if prop:
                 return ExprNode('GetMember', prop.data_type, root, Identifier(prop.name, prop.data_type, Modifiers.CONSTANT in prop.modifiers, Modifiers.CONSTEXPR in prop.modifiers))
-            errormodule.throw('semantic_error', 'Object has no member \'%s\'' % trailer.content[1].value, trailer.content[1])
+            errormodule.throw('semantic_error', 'Object has no member \'%s\'' % member_name, trailer.content[1])
         # assume struct or enum
         else:
-            identifier = trailer.content[1].value
+            identifier = member_name
             member_names = [x.name for x in root.data_type.members if x.name == identifier]
             if identifier in member_names:
                 member = [x for x in root.data_type.members if x.name == identifier][0]
@@ -390,10 +394,10 @@ def add_get_member_trailer(root, trailer):
             errormodule.throw('semantic_error', 'Object has no member \'%s\'' % identifier, trailer.content[1])
     # if it is a package
     elif isinstance(root, Package):
-        prop = root.get_member(trailer.content[1].value)
+        prop = root.get_member(member_name)
         if prop:
             return ExprNode('GetMember', prop.data_type, root, prop)
-        errormodule.throw('semantic_error', 'Package has no member \'%s\'' % trailer.content[1].value, trailer.content[1])
+        errormodule.throw('semantic_error', 'Package has no member \'%s\'' % member_name, trailer.content[1])
     # otherwise it is invalid
     else:
         errormodule.throw('semantic_error', '\'.\' is not valid for this object', trailer.content[0])
@@ -408,7 +412,7 @@ def add_aggregator_trailer(root, trailer):
             errormodule.throw('semantic_error', 'Unable to apply aggregation to operator to pointer', trailer)
         elif not root.data_type.data_type != types.DataTypes.STRING:
             errormodule.throw('semantic_error', 'Invalid data type from aggregation operator', trailer)
-        dt = types.DataType(types.DataTypes.CHAR, 0)
+        dt = types.data_type(types.DataTypes.CHAR)
     elif isinstance(root.data_type, types.CustomType):
         if not root.data_type.enumerable:
             errormodule.throw('semantic_error', 'Module used for aggregation is not enumerable', trailer)
@@ -433,11 +437,11 @@ def add_aggregator_trailer(root, trailer):
             # check dictionary
             if isinstance(dt, tuple):
                 params = aggregate_expr.data_type.parameters
-                if not types.coerce(params[0].data_type, dt[0]) or not types.coerce(params[1].data_type, dt[1]):
+                if not relations.coerce(params[0].data_type, dt[0]) or not relations.coerce(params[1].data_type, dt[1]):
                     errormodule.throw('semantic_error', 'Aggregator function parameters must match the key and value types of the dictionary', trailer.content[1])
             # check all others
             else:
-                if any(not types.coerce(x.data_type, dt) for x in aggregate_expr.data_type.parameters):
+                if any(not relations.coerce(x.data_type, dt) for x in aggregate_expr.data_type.parameters):
                     errormodule.throw('semantic_error', 'Aggregator function parameters must match the element type of the aggregate set', trailer.content[1])
             return ExprNode('Aggregate', aggregate_expr.data_type.return_type, root, aggregate_expr)
     # add operator aggregator
@@ -501,8 +505,12 @@ def generate_base(ast):
             # if it is not able to found in the table, throw an error
             if not sym:
                 errormodule.throw('semantic_error', 'Variable used without declaration', ast)
+            # packages are resolved by their member trailers
+            if isinstance(sym, Package):
+                return sym
             # otherwise return the Identifier
-            return Identifier(sym.name, sym.data_type, Modifiers.CONSTANT in sym.modifiers, Modifiers.CONSTEXPR in sym.modifiers)
+            return Identifier(sym.name, sym.data_type, Modifiers.CONSTANT in sym.modifiers, Modifiers.CONSTEXPR in sym.modifiers,
+                              getattr(sym, 'value', None) if Modifiers.CONSTANT in sym.modifiers else None)
         # if it is an instance pointer
         elif base.type == 'THIS':
             # get the group instance (typeof Instance)
@@ -514,39 +522,39 @@ def generate_base(ast):
             return module_instance
         # if null, return null literal
         elif base.type == 'NULL':
-            return Literal(types.DataType(types.DataTypes.NULL, 0), None)
+            return Literal(types.data_type(types.DataTypes.NULL), None)
         # if base is a bool literal
         elif base.type == 'BOOL_LITERAL':
-            return Literal(types.DataType(types.DataTypes.BOOL, 0), base.value.lower())
+            return Literal(types.data_type(types.DataTypes.BOOL), base.value.lower())
         # if base is value, return value
         else:
-            return Literal(types.DataType(types.DataTypes.VALUE, 0), 'value')
+            return Literal(types.data_type(types.DataTypes.VALUE), 'value')
     else:
         # if the base is character-like object
         if base.name == 'string':
             # if it is a char, return a char literal
             if base.content[0].type == 'CHAR_LITERAL':
-                return Literal(types.DataType(types.DataTypes.CHAR, 0), base.content[0].value)
+                return Literal(types.data_type(types.DataTypes.CHAR), base.content[0].value)
             # otherwise return a string literal
             else:
-                return Literal(types.DataType(types.DataTypes.STRING, 0), base.content[0].value)
+                return Literal(types.data_type(types.DataTypes.STRING), base.content[0].value)
         # if the base is numeric
         if base.name == 'number':
             # if it is a float
             if base.content[0].type == 'FLOAT_LITERAL':
-                return Literal(types.DataType(types.DataTypes.FLOAT, 0), base.content[0].value)
+                return Literal(types.data_type(types.DataTypes.FLOAT), base.content[0].value)
             # if it is a complex
             elif base.content[0].type == 'COMPLEX_LITERAL':
-                return Literal(types.DataType(types.DataTypes.COMPLEX, 0), base.content[0].value)
+                return Literal(types.data_type(types.DataTypes.COMPLEX), base.content[0].value)
             # if it is an integer or long
             else:
                 # if the integer's value is greater than the maximum value accepted by an int32
                 # it is taken as a long literal
                 if int(base.content[0].value) > 2147483647:
-                    return Literal(types.DataType(types.DataTypes.LONG, 0), base.content[0].value)
+                    return Literal(types.data_type(types.DataTypes.LONG), base.content[0].value)
                 # otherwise, it is taken as an integer literal (int32)
                 else:
-                    return Literal(types.DataType(types.DataTypes.INT, 0), base.content[0].value)
+                    return Literal(types.data_type(types.DataTypes.INT), base.content[0].value)
         # if it is a list literal
         elif base.name == 'list':
             # generate a list from the base tree
@@ -564,7 +572,7 @@ def generate_base(ast):
                     return generate_byte_array(val)
                 else:
                     # return raw byte literal (converted to hex literal)
-                    return Literal(types.DataType(types.DataTypes.BYTE, 0), hex(int(val[2:])))
+                    return Literal(types.data_type(types.DataTypes.BYTE), hex(int(val[2:])))
             else:
                 # if it has more than 2 digits (4 because prefix)
                 # MAX 0xFF
@@ -573,7 +581,7 @@ def generate_base(ast):
                     return generate_byte_array(val)
                 else:
                     # return raw byte array
-                    return Literal(types.DataType(types.DataTypes.BYTE, 0), val)
+                    return Literal(types.data_type(types.DataTypes.BYTE), val)
         # create array or dictionary
         elif base.name == 'array_map':
             # return generated literal
@@ -604,18 +612,18 @@ def generate_base(ast):
                     if isinstance(base.content[-1].content[0].content[1], ASTNode):
                         rt_type, gen = functions.get_return_type(base.content[-1].content[0].content[1])
                     else:
-                        rt_type, gen = types.DataType(types.DataTypes.NULL, 0), False
+                        rt_type, gen = types.data_type(types.DataTypes.NULL), False
                 else:
                     errormodule.throw('semantic_error', 'Inline functions must declare a body', base.content[-1])
                     return
-                dt = types.Function(parameters, rt_type, 0, is_async, gen)
+                dt = types.function(parameters, rt_type, 0, is_async, gen)
                 # in function literals, its value is its parameters
                 # TODO add body parsing to inline functions
                 fbody = base.content[-1].content[0].content[1] if isinstance(base.content[-1].content[0].content[1], ASTNode) else []
                 return Literal(dt, fbody)
             else:
                 return_type = functions.get_return_from_type(base.content[-1].content[1])
-                func = types.Function(parameters, return_type, 0, is_async, False)
+                func = types.function(parameters, return_type, 0, is_async, False)
                 return Literal(types.DataTypeLiteral(func), func)
         elif base.name == 'atom_types':
             tp = generate_type(base)
@@ -638,9 +646,9 @@ def generate_array_map(array_map):
         # check for tuples
         if isinstance(elem.data_type, types.Tuple):
             # TODO check tuple values
-            return Literal(types.ArrayType(elem.values[0].data_type, len(elem.data_type.values), 0), elem.data_type.values)
+            return Literal(types.array_type(elem.values[0].data_type, len(elem.data_type.values), 0), elem.data_type.values)
         # et = elem data_type
-        return Literal(types.ArrayType(elem.data_type, 1, 0), [elem])
+        return Literal(types.array_type(elem.data_type, 1, 0), [elem])
     # if the last element's (array_dict_branch) first element is a token
     elif isinstance(array_map_builder.content[-1].content[0], Token):
         if array_map_builder.content[-1].content[0].type == ':':
@@ -680,9 +688,9 @@ def generate_array_map(array_map):
                     def match(base_type, nt):
                         if base_type == nt:
                             return base_type
-                        elif types.coerce(base_type, nt):
+                        elif relations.coerce(base_type, nt):
                             return base_type
-                        nnt = types.dominant(nt, base_type)
+                        nnt = relations.dominant(nt, base_type)
                         if nnt:
                             return nnt
                         else:
@@ -696,7 +704,7 @@ def generate_array_map(array_map):
                 # create dictionary
                 get_true_dict(raw_dict[-1])
             # return dictionary literal
-            return Literal(types.MapType(kt, vt, 0), true_dict)
+            return Literal(types.map_type(kt, vt, 0), true_dict)
 
         # else assume it is an array and use the list generator
         else:
@@ -704,11 +712,11 @@ def generate_array_map(array_map):
                 # generate array base
                 lst = [generate_expr(array_map_builder.content[0]), generate_expr(array_map_builder.content[-1].content[-1])]
                 # type check array
-                dt = types.dominant(lst[0].data_type, lst[1].data_type)
+                dt = relations.dominant(lst[0].data_type, lst[1].data_type)
                 if not dt:
-                    dt = lst[1].data_type if types.coerce(lst[1].data_type, lst[0].data_type) else types.OBJECT_TEMPLATE
+                    dt = lst[1].data_type if relations.coerce(lst[1].data_type, lst[0].data_type) else types.OBJECT_TEMPLATE
                 # return compiled literal
-                return Literal(types.ArrayType(dt, 2, 0), lst)
+                return Literal(types.array_type(dt, 2, 0), lst)
             else:
                 # get the first element
                 f_elem = generate_expr(array_map_builder.content[0])
@@ -717,14 +725,14 @@ def generate_array_map(array_map):
                 # reuse list generator
                 lst = generate_list(array_map)
                 # check data types
-                if types.coerce(f_elem.data_type, lst.data_type.element_type):
+                if relations.coerce(f_elem.data_type, lst.data_type.element_type):
                     dt = f_elem.data_type
-                elif types.coerce(lst.data_type.element_type, f_elem.data_type):
+                elif relations.coerce(lst.data_type.element_type, f_elem.data_type):
                     dt = lst.data_type.element_type
                 else:
                     dt = types.OBJECT_TEMPLATE
                 # reformed list classified as array
-                return Literal(types.ArrayType(dt, len(lst.value) + 1, 0), [f_elem] + lst.value)
+                return Literal(types.array_type(dt, len(lst.value) + 1, 0), [f_elem] + lst.value)
 
 
 # generate a byte array from value of byte token
@@ -736,7 +744,7 @@ def generate_byte_array(bytes_string):
     # get each hexadecimal element organized into pairs (and re-add prefix)
     bytes_array = ['0x' + x for x in map(''.join, zip(*[iter(bytes_string)] * 2))]
     # create array literal
-    return Literal(types.ArrayType(types.DataType(types.DataTypes.BYTE, 0), len(bytes_array), 0), bytes_array)
+    return Literal(types.array_type(types.data_type(types.DataTypes.BYTE), len(bytes_array), 0), bytes_array)
 
 
 # generate a list literal from list astnode
@@ -778,8 +786,8 @@ def generate_list(lst):
         if dt:
             if elem.data_type != dt:
                 # check for type coercion
-                if not types.coerce(dt, elem.data_type):
-                    ndt = types.dominant(elem.data_type, dt)
+                if not relations.coerce(dt, elem.data_type):
+                    ndt = relations.dominant(elem.data_type, dt)
                     # if it is None
                     if not ndt:
                         dt = types.OBJECT_TEMPLATE
@@ -788,7 +796,7 @@ def generate_list(lst):
         else:
             # get root element type (assumed from first element)
             dt = elem.data_type
-    return Literal(types.ListType(dt, 0), true_list)
+    return Literal(types.list_type(dt, 0), true_list)
 
 
 ############################
@@ -828,14 +836,14 @@ def generate_comprehension(for_comp):
                 #                           ^^^^
                 cond_expr = generate_expr(item.content[1])
                 # check to see if it is conditional
-                if cond_expr.data_type != types.DataType(types.DataTypes.BOOL, 0):
+                if cond_expr.data_type != types.data_type(types.DataTypes.BOOL):
                     # throw error if not a boolean
                     errormodule.throw('semantic_error', 'Comprehension filter statement expression does not evaluate to a boolean', item)
                 # compile final result and add to args
                 l_args.append(ExprNode('ForIf', cond_expr.data_type, cond_expr))
     # exit lambda scope
     util.symbol_table.exit_scope()
-    return ExprNode('ForComprehension', types.ListType(fc_type, 0), *l_args)
+    return ExprNode('ForComprehension', types.list_type(fc_type, 0), *l_args)
 
 
 # iterator and atom to iterator
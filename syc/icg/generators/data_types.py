@@ -44,11 +44,11 @@ def generate_type(ext):
                 errormodule.throw('semantic_error', 'Invalid value for array bound', error_ast)
             elif count < 1:
                 errormodule.throw('semantic_error', 'Invalid value for array bound', error_ast)
-            return types.ArrayType(et, int(count), pointers)
+            return types.array_type(et, int(count), pointers)
         # assume list
         elif ext.content[0].type == 'LIST_TYPE':
             # ext.content[1].content[1] == pure_types -> list_modifier -> types
-            return types.ListType(generate_type(ext.content[1].content[1]), pointers)
+            return types.list_type(generate_type(ext.content[1].content[1]), pointers)
         # assume function
         elif ext.content[0].type in {'FUNC', 'ASYNC'}:
             params, return_types = None, None
@@ -58,7 +58,7 @@ def generate_type(ext):
                         params = generate_parameter_list(item)
                     elif item.name == 'rt_type':
                         return_types = get_return_from_type(item)
-            return types.Function(params, return_types, 0, ext.content[0].value == 'ASYNC', False)
+            return types.function(params, return_types, 0, ext.content[0].value == 'ASYNC', False)
         # assume dict
         else:
             # ext.content[1].content[1] == pure_types -> dict_modifier -> types
@@ -67,14 +67,14 @@ def generate_type(ext):
             if types.mutable(kt):
                 errormodule.throw('semantic_error', 'Invalid key type for dictionary', ext.content[1].content[1])
             # compile dictionary type
-            return types.MapType(kt, vt, pointers)
+            return types.map_type(kt, vt, pointers)
     else:
         if ext.content[0].name == 'pure_types':
             # data type literal
             if ext.content[0].content[0].type == 'DATA_TYPE':
                 return types.DataTypeLiteral(types.DataTypes.DATA_TYPE)
             # return matched pure types
-            return types.DataType({
+            return types.data_type({
                 'INT_TYPE': types.DataTypes.INT,
                 'BOOL_TYPE': types.DataTypes.BOOL,
                 'BYTE_TYPE': types.DataTypes.BYTE,
@@ -2,7 +2,6 @@ from syc.ast.ast import ASTNode, unparse
 from syc.icg.action_tree import ExprNode
 import errormodule
 from syc.icg.table import Package
-from copy import copy
 
 
 def generate_expr(expr):
@@ -24,9 +23,9 @@ def generate_expr(expr):
                 if not types.boolean(root.data_type):
                     errormodule.throw('semantic_error', 'Comparison expression of inline comparison must be a boolean', expr.content[0])
                 # get the dominant resulting type
-                dt = types.dominant(val1.data_type, val2.data_type)
+                dt = relations.dominant(val1.data_type, val2.data_type)
                 if not dt:
-                    dt = types.dominant(val2.data_type, val1.data_type)
+                    dt = relations.dominant(val2.data_type, val1.data_type)
                     # if neither can be overruled by each other, throw error
                     if not dt:
                         errormodule.throw('semantic_error', 'Types of inline comparison must be similar', item)
@@ -39,7 +38,7 @@ def generate_expr(expr):
                     # get root expression
                     logical = generate_logical(n_expr.content[1])
                     # ensure the root and logical are coercible / equivalent
-                    if types.coerce(root.data_type, logical.data_type):
+                    if relations.coerce(root.data_type, logical.data_type):
                         root = ExprNode('NullCoalesce', root.data_type, root, logical)
                     # otherwise it is an invalid null coalescence
                     else:
@@ -52,6 +51,7 @@ def generate_expr(expr):
 
 # allow for recursive imports
 import syc.icg.types as types
+import syc.icg.relations as relations
 import syc.icg.modules as modules
 import syc.icg.generators.functions as functions
 
@@ -86,18 +86,18 @@ def generate_logical(logical):
                     # check booleans and generate boolean operators
                     if tree.data_type.data_type == types.DataTypes.BOOL and tree.data_type.pointers == 0 and \
                                     root.data_type.data_type == types.DataTypes.BOOL and root.data_type.pointers == 0:
-                        root = ExprNode(op, types.DataType(types.DataTypes.BOOL, 0), root, tree)
+                        root = ExprNode(op, types.data_type(types.DataTypes.BOOL), root, tree)
                         continue
                     # generate bitwise operators
                     else:
                         # extract dominant type and if there is not one, throw error
-                        dom = types.dominant(root.data_type, tree.data_type)
+                        dom = relations.dominant(root.data_type, tree.data_type)
                         if dom:
-                            if not types.coerce(types.DataType(types.DataTypes.INT, 0), dom):
+                            if not relations.coerce(types.data_type(types.DataTypes.INT), dom):
                                 errormodule.throw('semantic_error', 'Unable to apply bitwise %s to object' % op.lower(), logical)
                             root = ExprNode('Bitwise' + op, dom, root, tree)
                         else:
-                            if not types.coerce(types.DataType(types.DataTypes.INT, 0), tree.data_type):
+                            if not relations.coerce(types.data_type(types.DataTypes.INT), tree.data_type):
                                 errormodule.throw('semantic_error', 'Unable to apply bitwise %s to object' % op.lower(), logical)
                             root = ExprNode('Bitwise' + op, tree.data_type, root, tree)
                 # handle operator overloading
@@ -192,13 +192,13 @@ def generate_comparison(comparison):
                             errormodule.throw('semantic_error', 'Invalid type match up for numeric comparison'
                                               , comparison)
                         if types.numeric(n_tree.data_type) and types.numeric(root.data_type):
-                            root = ExprNode(op, types.DataType(types.DataTypes.BOOL, 0), root, n_tree)
+                            root = ExprNode(op, types.data_type(types.DataTypes.BOOL), root, n_tree)
                         else:
                             errormodule.throw('semantic_error', 'Unable to use numeric comparison with non-numeric type'
                                               , comparison)
                     # generate standard comparison
                     elif op in {'==', '!=', '===', '!=='}:
-                        root = ExprNode(op, types.DataType(types.DataTypes.BOOL, 0), root, n_tree)
+                        root = ExprNode(op, types.data_type(types.DataTypes.BOOL), root, n_tree)
                 # if it is not a base expression, it is an operators
                 elif item.name == 'comparison_op':
                     op = item.content[0].value
@@ -332,54 +332,10 @@ def generate_arithmetic(ari):
 
 
 def check_operands(dt1, dt2, operator, ast):
-    # check for custom type mismatch
-    if not isinstance(dt1, types.CustomType) and isinstance(dt2, types.CustomType):
-        errormodule.throw('semantic_error', 'Invalid type match up for numeric operator', ast)
-    # check for invalid pointer arithmetic
-    if dt1.pointers > 0:
-        if isinstance(dt2, types.DataType):
-            if dt2.data_type == types.DataTypes.INT and dt2.pointers == 0:
-                return dt1
-        errormodule.throw('semantic_error', 'Pointer arithmetic can only be performed between an integer and a pointer', ast)
-    # check addition operator
-    if operator == '+':
-        # numeric addition
-        if types.numeric(dt1) and types.numeric(dt2):
-            if types.coerce(dt1, dt2):
-                return dt2
-            return dt1
-        # list / string concatenation
-        elif types.enumerable(dt1) and types.enumerable(dt2):
-            if dt1 == dt2:
-                return dt1
-            # check arrays and lists
-            elif (isinstance(dt1, types.ArrayType) or isinstance(dt1, types.ListType)) and \
-                    (isinstance(dt2, types.ArrayType) or isinstance(dt2, types.ListType)):
-                if dt1.element_type == dt2.element_type:
-                    return dt1
-            errormodule.throw('semantic_error', 'Unable to apply operator to dissimilar enumerable types', ast)
-        errormodule.throw('semantic_error', 'Invalid type(s) for operator \'%s\'' % operator, ast)
-    # check multiply operator
-    elif operator == '*':
-        # numeric multiplication
-        if types.numeric(dt1) and types.numeric(dt2):
-            if types.coerce(dt1, dt2):
-                return dt2
-            return dt1
-        # string multiplication
-        if isinstance(dt1, types.DataType) and isinstance(dt2, types.DataType):
-            # we can assume val1's pointers
-            if dt2.pointers == 0:
-                if dt1.data_type == types.DataTypes.STRING and dt2.data_type == types.DataTypes.INT:
-                    return dt1
-        errormodule.throw('semantic_error', 'Invalid type(s) for operator \'%s\'' % operator, ast)
-    # check all other operators
-    else:
-        if types.numeric(dt1) and types.numeric(dt2):
-            if types.coerce(dt1, dt2):
-                return dt2
-            return dt1
-        errormodule.throw('semantic_error', 'Invalid type(s) for operator \'%s\'' % operator, ast)
+    dt, error = relations.binary_result(operator, dt1, dt2)
+    if error:
+        errormodule.throw('semantic_error', error, ast)
+    return dt
 
 
 def generate_unary_atom(u_atom):
@@ -418,9 +374,8 @@ def generate_unary_atom(u_atom):
                 # throw error
                 errormodule.throw('semantic_error', 'Unable to change sine on non-numeric type.', u_atom)
         elif prefix.type == 'AMP':
-            dt = copy(atom.data_type)
             # create pointer
-            dt.pointers += 1
+            dt = types.pointer(atom.data_type)
             # reference pointer
             return ExprNode('Reference', dt, atom)
         # handle deref op
@@ -433,12 +388,10 @@ def generate_unary_atom(u_atom):
             elif isinstance(atom.data_type, types.VoidPointer):
                 if atom.data_type.pointers <= do:
                     errormodule.throw('semantic_error', 'Unable to dereference void pointer', u_atom.content[0])
-                vp = copy(atom.data_type)
-                vp.pointers -= 1
+                vp = types.pointer(atom.data_type, -1)
                 return ExprNode('Dereference', vp, do, atom)
             else:
-                dt = copy(atom.data_type)
-                dt.pointers -= do
+                dt = types.pointer(atom.data_type, -do)
                 # return dereference with count
                 return ExprNode('Dereference', dt, do, atom)
 
@@ -1,6 +1,6 @@
 from syc.ast.ast import ASTNode, unparse
 import errormodule
-from syc.icg.types import coerce, dominant
+from syc.icg.relations import coerce, dominant
 
 
 # generates the declared list of params for any function (an array of symbols)
@@ -6,6 +6,7 @@ from syc.icg.action_tree import ExprNode, Identifier, StatementNode
 import util
 from syc.icg.table import Symbol, Modifiers
 import syc.icg.types as types
+import syc.icg.relations as relations
 from syc.icg.modules import get_instance
 from syc.icg.constexpr import check as check_constexpr
 from copy import copy
@@ -145,17 +146,17 @@ def generate_variable_declaration(stmt, modifiers):
                         elif hasattr(v, 'initializer'):
                             errormodule.throw('semantic_error', '%s cannot have two initializers' % ('constant' if constant else 'variable'), k)
                         # if there is a type mismatch between the type extension and the given initializer value
-                        elif not types.coerce(v.data_type, initializer.data_type.values[pos].data_type):
+                        elif not relations.coerce(v.data_type, initializer.data_type.values[pos].data_type):
                             errormodule.throw('semantic_error', 'Variable type extension and initializer data types do not match', k)
                 # otherwise, it is invalid
                 else:
                     errormodule.throw('semantic_error', 'Multi-%s declaration cannot have single global initializer' % ('constant' if constant else 'variable'), stmt)
-            # constexpr value (constexpr(s) store value so they can be evaluated at compile-time)
+            # constant value (constants store value so they can be evaluated at compile-time)
             val = None
-            if v.constexpr:
+            if constant and hasattr(v, 'initializer'):
                 val = v.initializer
             # generate symbol object
-            # identifier name, data type, modifiers, value (if constexpr)
+            # identifier name, data type, modifiers, value (if constant)
             sym = Symbol(k.value, v.data_type if hasattr(v, 'data_type') else overall_type, modifiers + [Modifiers.CONSTEXPR] if v.constexpr else modifiers, value=val)
             # if the symbol lacks a data type
             if not sym.data_type:
@@ -181,7 +182,7 @@ def generate_variable_declaration(stmt, modifiers):
         if not overall_type and isinstance(initializer.data_type, types.DataType) and initializer.data_type.data_type == types.DataTypes.NULL:
             errormodule.throw('semantic_error', 'Unable to infer data type of variable', stmt)
         # check for type extension and initializer mismatch
-        if overall_type and initializer and not types.coerce(overall_type, initializer.data_type):
+        if overall_type and initializer and not relations.coerce(overall_type, initializer.data_type):
             errormodule.throw('semantic_error', 'Variable type extension and initializer data types do not match', stmt)
         # add constexpr if marked as such
         if constexpr:
@@ -190,7 +191,7 @@ def generate_variable_declaration(stmt, modifiers):
             if not check_constexpr(initializer):
                 errormodule.throw('semantic_error', 'Expected constexpr', stmt)
         # add to symbol table
-        util.symbol_table.add_variable(Symbol(variables.value, overall_type if overall_type else initializer.data_type, modifiers, None if not constexpr else initializer), stmt)
+        util.symbol_table.add_variable(Symbol(variables.value, overall_type if overall_type else initializer.data_type, modifiers, None if not constant else initializer), stmt)
         # return generated statement node
         return StatementNode('DeclareConstant' if constant else 'DeclareVariable', overall_type, variables.value, initializer, modifiers)
 
@@ -213,7 +214,7 @@ def generate_var(var_ast):
             if 'initializer' in variable:
                 # if it has a data type, type check the initializer
                 if 'data_type' in final_variable:
-                    if not types.coerce(final_variable['data_type'], variable['initializer'].data_type):
+                    if not relations.coerce(final_variable['data_type'], variable['initializer'].data_type):
                         errormodule.throw('semantic_error', 'Variable type extension and initializer data types do not match', variable['name'])
                 else:
                     # else infer from initializer
@@ -303,13 +304,12 @@ def generate_assignment(assignment):
             # if it is a data type
             if isinstance(root.data_type, types.DataTypeLiteral):
                 # get new pointer type
-                dt = copy(root.data_type)
-                dt.pointers += 1
+                dt = types.pointer(root.data_type)
                 # return memory allocation with size of type
-                expr = ExprNode('Malloc', dt, ExprNode('SizeOf', types.DataType(types.DataTypes.INT, 1), root))
+                expr = ExprNode('Malloc', dt, ExprNode('SizeOf', types.data_type(types.DataTypes.INT, 1), root))
             else:
                 # if it is not an integer
-                if root.data_type != types.DataType(types.DataTypes.INT, 0):
+                if root.data_type != types.data_type(types.DataTypes.INT):
                     # all tests failed, not allocatable
                     errormodule.throw('semantic_error', 'Unable to dynamically allocate memory for object', assignment)
                 else:
@@ -360,8 +360,7 @@ def generate_assign_var(assign_var):
         # check for non-pointer dereference
         if deref_count > root.data_type.pointers:
             errormodule.throw('semantic_error', 'Unable to dereference a non-pointers', assign_var)
-        dt = copy(root.data_type)
-        dt.pointers -= deref_count
+        dt = types.pointer(root.data_type, -deref_count)
         return ExprNode('Dereference', dt, deref_count, root)
 
 
@@ -423,7 +422,7 @@ def generate_assignment_expr(root, assign_expr):
             if not modifiable(var):
                 errormodule.throw('semantic_error', 'Unable to modify unmodifiable l-value', assign_expr)
             # if there is a type mismatch
-            if not types.coerce(var.data_type, expr.data_type):
+            if not relations.coerce(var.data_type, expr.data_type):
                 errormodule.throw('semantic_error', 'Variable type and reassignment type do not match', assign_expr)
             # if there is a compound operator
             if op.type != '=' and not types.numeric(var.data_type):
@@ -0,0 +1,148 @@
+import hashlib
+import pickle
+from enum import Enum
+
+import util
+import syc.ast.cache as ast_cache
+from syc.icg.table import SymbolTable
+
+# package interfaces
+# an interface stores what importers of a package can see (its export table) so unchanged packages do not have to be
+# lexed, parsed and generated again
+# it also records the package's includes and which of their exported symbols it used, so the package is only rebuilt
+# when one of those symbols changes
+
+# version of the interface format (increment whenever the format or what is exported changes)
+INTERFACE_VERSION = 3
+
+# key of the hash of all export names (packages that are used depend on every name they export)
+NAMES = '.names'
+
+# interfaces kept in memory by their path (None unless enabled by a long running process, see daemon)
+retained = None
+
+
+# get the path of the interface of a package (packages are keyed by their directory and source)
+# the grammar and token set are part of the key as they decide what the source parses to
+def get_path(code, directory):
+    key = hashlib.sha256(('%d:%s:%s\n%s\n%s' % (INTERFACE_VERSION, util.VERSION, ast_cache.get_config_hash(), directory, code)).encode()).hexdigest()
+    return '%s/interface/%s.syi' % (util.CACHE_DIR, key)
+
+
+# load the interface of a package's current source (None if there is none)
+# interfaces hold the hashes of each exported symbol (symbols), the includes of the package (dependencies) and its exports
+def load(code, directory):
+    path = get_path(code, directory)
+    if retained is not None and path in retained:
+        return retained[path]
+    try:
+        with open(path, 'rb') as file:
+            data = pickle.load(file)
+        if data['version'] == INTERFACE_VERSION:
+            if retained is not None:
+                retained[path] = data
+            return data
+    # missing or corrupt interfaces are treated as missing
+    except (OSError, EOFError, KeyError, TypeError, ValueError, pickle.UnpicklingError):
+        pass
+
+
+# get the package content (IR Object) stored in an interface (None if it can not be loaded)
+def load_content(data):
+    table = SymbolTable()
+    try:
+        table.exports = pickle.loads(data['exports'])
+    except (EOFError, TypeError, ValueError, AttributeError, ImportError, pickle.UnpicklingError):
+        return
+    return type('Object', (), dict(symbol_table=table, action_tree=None))
+
+
+# get the canonical serialization of a value (used to hash exports)
+# unlike pickle, the serialization does not depend on the order sets and dicts were filled in
+def dumps(value, seen=None):
+    parts = []
+    serialize(value, parts, {} if seen is None else seen)
+    return ''.join(parts)
+
+
+# add the canonical serialization of a value to parts
+# objects already serialized are referenced by the order they were serialized in (objects can be shared and cyclic)
+def serialize(value, parts, seen):
+    if value is None or isinstance(value, (bool, int, float, complex, str, bytes, Enum)):
+        parts.append(repr(value))
+    # classes and functions are stored by reference
+    elif isinstance(value, type) or (callable(value) and hasattr(value, '__qualname__')):
+        parts.append('<%s.%s>' % (value.__module__, value.__qualname__))
+    elif id(value) in seen:
+        parts.append('@%d' % seen[id(value)])
+    else:
+        seen[id(value)] = len(seen)
+        if isinstance(value, (list, tuple)):
+            parts.append('[' if isinstance(value, list) else '(')
+            for item in value:
+                serialize(item, parts, seen)
+                parts.append(',')
+            parts.append(']' if isinstance(value, list) else ')')
+        elif isinstance(value, (set, frozenset)):
+            parts.append('{%s}' % ','.join(sorted(key_string(x, seen) for x in value)))
+        elif isinstance(value, dict):
+            serialize_items(value, parts, seen)
+        else:
+            parts.append(type(value).__qualname__)
+            serialize_items(get_state(value), parts, seen)
+
+
+# add the items of a dictionary sorted by their keys to parts
+def serialize_items(dct, parts, seen):
+    # keys are serialized on their own so they can be sorted
+    keys = {key_string(x, seen): x for x in dct}
+    parts.append('{')
+    for key in sorted(keys):
+        parts.append(key)
+        parts.append(':')
+        serialize(dct[keys[key]], parts, seen)
+        parts.append(',')
+    parts.append('}')
+
+
+# serialize an item of a set or a key of a dictionary on its own
+def key_string(value, seen):
+    if isinstance(value, str):
+        return repr(value)
+    return dumps(value, dict(seen))
+
+
+# get the attributes of an object that are stored (see Package.__getstate__)
+def get_state(obj):
+    if getattr(type(obj), '__getstate__', None) not in {None, getattr(object, '__getstate__', None)}:
+        return obj.__getstate__()
+    state = dict(getattr(obj, '__dict__', {}))
+    for cls in type(obj).__mro__:
+        slots = getattr(cls, '__slots__', ())
+        for slot in [slots] if isinstance(slots, str) else slots:
+            if hasattr(obj, slot):
+                state[slot] = getattr(obj, slot)
+    return state
+
+
+# write the interface of a package
+# dependencies are (include name, file path, hashes of the symbols it used from the include, is used) for each include
+# returns the hashes of the exported symbols (None if the exports could not be stored)
+def store(code, directory, dependencies, exports):
+    try:
+        exports_data = pickle.dumps(exports, pickle.HIGHEST_PROTOCOL)
+        symbols = {name: hashlib.sha256(dumps(exports[name]).encode()).hexdigest() for name in exports}
+    # exports can hold objects that can not be stored (generated parameter classes, ect.)
+    except (pickle.PicklingError, TypeError, AttributeError, RecursionError):
+        return
+    symbols[NAMES] = hashlib.sha256('\n'.join(sorted(exports)).encode()).hexdigest()
+    data = {
+        'version': INTERFACE_VERSION,
+        'symbols': symbols,
+        'dependencies': dependencies,
+        'exports': exports_data
+    }
+    if retained is not None:
+        retained[get_path(code, directory)] = data
+    util.write_cache(get_path(code, directory), pickle.dumps(data, pickle.HIGHEST_PROTOCOL))
+    return symbols
@@ -0,0 +1,222 @@
+import time
+
+import profiler
+import util
+import syc.icg.types as types
+from syc.icg.action_tree import ExprNode, StatementNode, Literal, Identifier
+
+################
+# TREE WALKING #
+################
+
+
+# iterate through every action tree node in a tree (parents before children)
+def walk(tree):
+    nodes = [tree]
+    while nodes:
+        node = nodes.pop()
+        if isinstance(node, list):
+            nodes.extend(reversed(node))
+        elif isinstance(node, ExprNode) or isinstance(node, StatementNode):
+            yield node
+            nodes.extend(reversed(node.arguments))
+        elif isinstance(node, Literal) or isinstance(node, Identifier):
+            yield node
+
+
+# count the action tree nodes in a tree
+def count_nodes(tree):
+    return sum(1 for _ in walk(tree))
+
+
+# replace every node in a tree with the result of transform (children are transformed before their parents)
+# the tree is rewritten in place, the (possibly replaced) root is returned
+def rewrite(tree, transform):
+    root = [tree]
+    # lists being rewritten [list, next position, node the list belongs to, list holding that node, position of that node]
+    stack = [[root, 0, None, None, 0]]
+    while stack:
+        frame = stack[-1]
+        items, i = frame[0], frame[1]
+        if i < len(items):
+            frame[1] += 1
+            item = items[i]
+            if isinstance(item, ExprNode) or isinstance(item, StatementNode):
+                stack.append([item.arguments, 0, item, items, i])
+            elif isinstance(item, list):
+                stack.append([item, 0, None, None, 0])
+            elif isinstance(item, Literal) or isinstance(item, Identifier):
+                items[i] = replace(item, transform)
+        else:
+            stack.pop()
+            # all arguments are rewritten, so the node itself can be
+            node, parent, ndx = frame[2], frame[3], frame[4]
+            if node is not None:
+                parent[ndx] = replace(node, transform)
+    return root[0]
+
+
+# replacements made by rewrite that changed the data type of a node [(node, replacement)] (None unless passes are verified)
+type_changes = None
+
+
+# transform a node (noting the replacement if it has a different data type)
+def replace(node, transform):
+    new_node = transform(node)
+    if type_changes is not None and new_node is not node and getattr(new_node, 'data_type', None) != getattr(node, 'data_type', None):
+        type_changes.append((node, new_node))
+    return new_node
+
+
+# copy the nodes of a tree (leaves are shared as passes replace them instead of modifying them)
+def copy_tree(tree):
+    root = [tree]
+    lists = [root]
+    while lists:
+        items = lists.pop()
+        for i, item in enumerate(items):
+            if isinstance(item, ExprNode):
+                items[i] = ExprNode(item.name, item.data_type, *item.arguments)
+                lists.append(items[i].arguments)
+            elif isinstance(item, StatementNode):
+                items[i] = StatementNode(item.statement, *item.arguments)
+                lists.append(items[i].arguments)
+            elif isinstance(item, list):
+                items[i] = list(item)
+                lists.append(items[i])
+    return root[0]
+
+
+# get the data types of the outermost expressions of a tree (the types statements see)
+def type_signature(tree):
+    signature = []
+    nodes = [tree]
+    while nodes:
+        node = nodes.pop()
+        if isinstance(node, list):
+            nodes.extend(reversed(node))
+        elif isinstance(node, StatementNode):
+            nodes.extend(reversed(node.arguments))
+        elif isinstance(node, ExprNode) or isinstance(node, Literal) or isinstance(node, Identifier):
+            signature.append(node.data_type)
+    return signature
+
+
+##########
+# PASSES #
+##########
+
+# all passes take an action tree and return the optimized tree
+
+
+# evaluate every constant subtree at compile-time and replace it with a Literal
+# the values of constants are propagated to where they are used
+def fold_constants(tree):
+    # the constant evaluator is loaded on first use
+    import syc.icg.constexpr as constexpr
+    # folded initializers of constants by their id (initializer, folded initializer)
+    folded = {}
+
+    def transform(node):
+        if isinstance(node, ExprNode):
+            literal = constexpr.fold(node)
+            return literal if literal else node
+        elif isinstance(node, Identifier) and node.constant and node.value is not None:
+            if id(node.value) not in folded:
+                # the initializer is shared with the declaring symbol (which can belong to another package), so a copy is folded
+                folded[id(node.value)] = (node.value, rewrite(copy_tree(node.value), transform))
+            value = folded[id(node.value)][1]
+            if isinstance(value, Literal):
+                # recreate the literal as the constant's type (which the initializer was coerced to)
+                literal = constexpr.make_literal(constexpr.literal_value(value), node.data_type)
+                if literal:
+                    return literal
+        return node
+    return rewrite(tree, transform)
+
+
+# remove type casts to the type the value already has
+def remove_redundant_casts(tree):
+    def transform(node):
+        # TypeCast(type, value)
+        if isinstance(node, ExprNode) and node.name == 'TypeCast' and len(node.arguments) == 2:
+            value = node.arguments[1]
+            if hasattr(value, 'data_type') and value.data_type == node.data_type:
+                return value
+        return node
+    return rewrite(tree, transform)
+
+
+# remove pairs of unary operations that cancel out (--x, !!x, *&x)
+def simplify_unary(tree):
+    def transform(node):
+        if not isinstance(node, ExprNode):
+            return node
+        if node.name in {'ChangeSine', 'Not'} and len(node.arguments) == 1:
+            inner = node.arguments[0]
+            if isinstance(inner, ExprNode) and inner.name == node.name and getattr(inner.arguments[0], 'data_type', None) == node.data_type:
+                # !! is only an identity for booleans
+                if node.name == 'ChangeSine' or types.boolean(node.data_type):
+                    return inner.arguments[0]
+        # Dereference(count, value)
+        elif node.name == 'Dereference' and node.arguments[0] == 1:
+            inner = node.arguments[1]
+            if isinstance(inner, ExprNode) and inner.name == 'Reference' and getattr(inner.arguments[0], 'data_type', None) == node.data_type:
+                return inner.arguments[0]
+        return node
+    return rewrite(tree, transform)
+
+
+# merge left nested arithmetic operations into a single operation ((a + b) + c => a + b + c)
+def flatten_arithmetic(tree):
+    def transform(node):
+        if isinstance(node, ExprNode) and node.name in {'+', '-', '*', '/', '%'}:
+            first = node.arguments[0]
+            # arithmetic nodes are evaluated left to right, so only the first argument can be merged
+            if isinstance(first, ExprNode) and first.name == node.name and first.data_type == node.data_type:
+                node.arguments = first.arguments + node.arguments[1:]
+        return node
+    return rewrite(tree, transform)
+
+
+# passes run at each optimization level (in order)
+pipelines = {
+    0: [],
+    1: [fold_constants, remove_redundant_casts],
+    2: [fold_constants, remove_redundant_casts, simplify_unary],
+    3: [fold_constants, remove_redundant_casts, simplify_unary, flatten_arithmetic]
+}
+
+
+# runs a pipeline of passes over action trees
+class PassManager:
+    def __init__(self, passes, verify=False):
+        self.passes = passes
+        # check that passes do not change the data types of expressions
+        self.verify = verify
+        # (pass name, time in seconds, nodes before, nodes after) of every pass run
+        self.timings = []
+
+    # verified passes have to keep the data type of every node they keep and of every node they replace
+    def run(self, tree):
+        global type_changes
+        for opt_pass in self.passes:
+            before = count_nodes(tree)
+            if self.verify:
+                signature = type_signature(tree)
+                # nodes are kept alive with their data types so their ids are not reused
+                node_types = {id(x): (x, getattr(x, 'data_type', None)) for x in walk(tree)}
+                type_changes = []
+            start = time.perf_counter()
+            try:
+                with profiler.span(opt_pass.__name__, 'passes'):
+                    tree = opt_pass(tree)
+            finally:
+                changes, type_changes = type_changes, None
+            self.timings.append((opt_pass.__name__, time.perf_counter() - start, before, count_nodes(tree)))
+            if self.verify:
+                changed = changes or type_signature(tree) != signature or \
+                    any(id(x) in node_types and getattr(x, 'data_type', None) != node_types[id(x)][1] for x in walk(tree))
+                if changed:
+                    raise util.SyCloneRecoverableError('Optimization pass \'%s\' changed the data type of an expression.' % opt_pass.__name__)
+        return tree
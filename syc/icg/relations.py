@@ -0,0 +1,157 @@
+import syc.icg.types as types
+
+# memoized type relations
+# interned types are never modified, so relations between them can be cached by the types themselves
+# relations involving any other type (custom types, ect.) are evaluated every time
+
+# hits and misses of each query since the last reset
+stats = {
+    'coerce': {'hits': 0, 'misses': 0},
+    'cast': {'hits': 0, 'misses': 0},
+    'binary_result': {'hits': 0, 'misses': 0}
+}
+
+# cached results of each query by their arguments
+caches = {
+    'coerce': {},
+    'cast': {},
+    'binary_result': {}
+}
+
+
+def reset_stats():
+    for name in stats:
+        stats[name]['hits'] = 0
+        stats[name]['misses'] = 0
+
+
+# clear the cached relations (the coercion lattice of the primitive types is computed again)
+def reset():
+    for name in caches:
+        caches[name].clear()
+    precompute()
+
+
+# get the fraction of queries answered from the cache
+def hit_rate(name):
+    total = stats[name]['hits'] + stats[name]['misses']
+    return stats[name]['hits'] / total if total else 0
+
+
+# check if a type is interned (along with every type it is made of)
+def cacheable(dt):
+    if isinstance(dt, types.DataType):
+        return types.interned.get((types.DataType, dt.data_type, dt.pointers)) is dt
+    elif isinstance(dt, types.ArrayType):
+        return cacheable(dt.element_type) and types.interned.get((types.ArrayType, dt.element_type, dt.count, dt.pointers)) is dt
+    elif isinstance(dt, types.ListType):
+        return cacheable(dt.element_type) and types.interned.get((types.ListType, dt.element_type, dt.pointers)) is dt
+    elif isinstance(dt, types.MapType):
+        return cacheable(dt.key_type) and cacheable(dt.value_type) and \
+            types.interned.get((types.MapType, dt.key_type, dt.value_type, dt.pointers)) is dt
+    elif isinstance(dt, types.Function):
+        # parameters are generated once and keyed by identity, so only their types have to be checked
+        return_types = dt.return_type if isinstance(dt.return_type, list) else [dt.return_type]
+        parameter_types = [getattr(x, 'data_type', None) for x in dt.parameters or []]
+        return all(x is None or cacheable(x) for x in return_types + parameter_types) and \
+            types.interned.get((types.Function, types.hashable(dt.parameters), types.hashable(dt.return_type), dt.pointers, dt.async, dt.generator)) is dt
+    return False
+
+
+# look up a relation in its cache, evaluating it on a miss
+# the arguments are types and operators (strings)
+def query(name, evaluate, *key):
+    if not all(isinstance(x, str) or cacheable(x) for x in key):
+        stats[name]['misses'] += 1
+        return evaluate(*key)
+    cache = caches[name]
+    if key in cache:
+        stats[name]['hits'] += 1
+        return cache[key]
+    stats[name]['misses'] += 1
+    result = evaluate(*key)
+    cache[key] = result
+    return result
+
+
+# check if type can be coerced (see types.coerce)
+def coerce(base_type, unknown):
+    return query('coerce', types.coerce, base_type, unknown)
+
+
+# get dominant type from two different types (see types.dominant)
+def dominant(base_type, unknown):
+    if coerce(base_type, unknown):
+        return base_type
+
+
+# check if a dynamic cast is valid (see casting.dynamic_cast)
+def cast(dt1, dt2):
+    # casting is loaded on first use
+    import syc.icg.casting as casting
+    return query('cast', casting.dynamic_cast, dt1, dt2)
+
+
+# get the result of applying a binary operator to two types
+# returns the resulting type and the error message (None if the operator is valid)
+def binary_result(operator, dt1, dt2):
+    return query('binary_result', operator_result, operator, dt1, dt2)
+
+
+# evaluate the result of a binary operator (uncached)
+def operator_result(operator, dt1, dt2):
+    # check for custom type mismatch
+    if not isinstance(dt1, types.CustomType) and isinstance(dt2, types.CustomType):
+        return None, 'Invalid type match up for numeric operator'
+    # check for invalid pointer arithmetic
+    if dt1.pointers > 0:
+        if isinstance(dt2, types.DataType):
+            if dt2.data_type == types.DataTypes.INT and dt2.pointers == 0:
+                return dt1, None
+        return None, 'Pointer arithmetic can only be performed between an integer and a pointer'
+    # check addition operator
+    if operator == '+':
+        # numeric addition
+        if types.numeric(dt1) and types.numeric(dt2):
+            if coerce(dt1, dt2):
+                return dt2, None
+            return dt1, None
+        # list / string concatenation
+        elif types.enumerable(dt1) and types.enumerable(dt2):
+            if dt1 == dt2:
+                return dt1, None
+            # check arrays and lists
+            elif (isinstance(dt1, types.ArrayType) or isinstance(dt1, types.ListType)) and \
+                    (isinstance(dt2, types.ArrayType) or isinstance(dt2, types.ListType)):
+                if dt1.element_type == dt2.element_type:
+                    return dt1, None
+            return None, 'Unable to apply operator to dissimilar enumerable types'
+    # check multiply operator
+    elif operator == '*':
+        # numeric multiplication
+        if types.numeric(dt1) and types.numeric(dt2):
+            if coerce(dt1, dt2):
+                return dt2, None
+            return dt1, None
+        # string multiplication
+        if isinstance(dt1, types.DataType) and isinstance(dt2, types.DataType):
+            # we can assume val1's pointers
+            if dt2.pointers == 0:
+                if dt1.data_type == types.DataTypes.STRING and dt2.data_type == types.DataTypes.INT:
+                    return dt1, None
+    # check all other operators
+    elif types.numeric(dt1) and types.numeric(dt2):
+        if coerce(dt1, dt2):
+            return dt2, None
+        return dt1, None
+    return None, 'Invalid type(s) for operator \'%s\'' % operator
+
+
+# precompute the coercion lattice of the primitive types
+def precompute():
+    for base in types.DataTypes:
+        for unknown in types.DataTypes:
+            caches['coerce'][(types.data_type(base), types.data_type(unknown))] = types.coerce(types.data_type(base), types.data_type(unknown))
+
+
+precompute()
@@ -44,13 +44,29 @@ class Symbol:
 
 
 class Package:
-    def __init__(self, name, symbol_table, action_tree):
+    def __init__(self, name, symbol_table, action_tree, external=False):
         self.name = name
         self.data_type = DataTypes.PACKAGE
         self.pointers = 0
+        # symbols exported by the package (name -> Symbol)
+        self.exports = symbol_table.exports
+        self.action_tree = action_tree
+        # whether or not the package is exported on to packages including this one
+        self.external = external
+        # names of the exports that were accessed (shared with the including table, see SymbolTable.consumed)
+        self.consumed = set()
+
+    # package interfaces only store what importers can see (not the package's action tree or its usage)
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state['action_tree'] = None
+        state['consumed'] = set()
+        return state
 
     def get_member(self, name):
-        pass
+        if name in self.exports:
+            self.consumed.add(name)
+            return self.exports[name]
 
     def open(self):
         pass
@@ -59,180 +75,121 @@ class Package:
 from syc.icg.types import DataTypes
 
 
+# single scope in the symbol table
+class Scope:
+    def __init__(self, parent=None):
+        # enclosing scope (None for the global scope)
+        self.parent = parent
+        # symbols and sub scopes in the order they were added
+        self.items = []
+        # symbols by name
+        self.symbols = {}
+        # deleted symbols by name (kept so they can not be redeclared)
+        self.deleted = {}
+
+
 class SymbolTable:
     def __init__(self):
         # main global table
-        self.table = []
-        # path to current scope (integer positions of sub scopes in each layer)
-        self.scope_path = []
+        self.table = Scope()
         # current working scope
-        self.scope = []
-        # current position in the working scope
-        self.pos = 0
-
-    # adds the new scope to the table
-    def update_scope(self, tb, scope_pos=0):
-        if scope_pos < len(self.scope_path):
-            tb[self.scope_path[scope_pos]] = self.update_scope(tb[self.scope_path[scope_pos]], scope_pos + 1)
-            return tb
-        else:
-            return self.scope
+        self.scope = self.table
+        # external symbols of the table by name (built once the table is complete)
+        self.exports = {}
+        # names of the exports used from each included package by the id of its content (content, names)
+        # used to decide which packages have to be rebuilt when an included package changes
+        self.consumed = {}
+        # symbols added by used packages by name (symbol, used names of its package)
+        self.imported = {}
 
     def add_scope(self):
-        # add on new sub scope
-        self.scope.append([])
-
-        # update table
-        self.table = self.update_scope(self.table)
-
-        # enter the new scope
-        self.scope = self.scope[self.pos]
-        # add previous position to scope path
-        self.scope_path.append(self.pos)
-        # reset position
-        self.pos = 0
+        # add on new sub scope and enter it
+        sub_scope = Scope(self.scope)
+        self.scope.items.append(sub_scope)
+        self.scope = sub_scope
 
     def exit_scope(self):
-        # if the working scope has been updated
-        updated_scope = False
-
-        # update the main table and update working scope
-        def update_table(tb, scope_pos=0):
-            # if the there are still more scope paths to follow
-            if scope_pos < len(self.scope_path):
-                # set the scope path sub section to the updated sub section
-                # increment scope_pos to allow for recursion
-                # pass in sub table to narrow modification range
-                tb[self.scope_path[scope_pos]] = update_table(tb[self.scope_path[scope_pos]], scope_pos + 1)
-                # will not execute until table has been updated
-
-                # access outer variable updated_scope
-                nonlocal updated_scope
-                if not updated_scope:
-                    # update scope to current outer table
-                    self.scope = tb
-                    # set boolean to prevent other layers from incorrectly changing the scope
-                    updated_scope = True
-                return tb
-            # return the current scope
-            # updates the scope path
-            else:
-                return self.scope
-
-        # call with global table
-        self.table = update_table(self.table)
-        # remove layer from scope path
-        self.scope_path.pop()
+        # return to the enclosing scope
+        self.scope = self.scope.parent
 
     # add variable to symbol table
     def add_variable(self, sym, ast):
         # compile symbol from action tree Identifier
-        if sym.name in [x.name for x in self.scope if isinstance(x, Symbol)]:
+        if sym.name in self.scope.symbols or sym.name in self.scope.deleted:
             # throw error
             errormodule.throw('semantic_error', 'Variable \'%s\' redeclared.' % sym.name, ast)
-        self.scope.append(sym)
-        # update table
-        self.table = self.update_scope(self.table)
-        # add to pos
-        self.pos += 1
+        self.scope.items.append(sym)
+        self.scope.symbols[sym.name] = sym
 
     # add package to symbol table
     # NOTE packages content is expected to be IR Object
     def add_package(self, pkg):
-        # if the package is used, add raw include table to it
-        # if pkg.used:
-        #     self.scope += self.remove_externals(pkg.content.symbol_table.table)
-        # else:
-        #     # neither symbol has groups, name is name, data_type is PACKAGE with no pointers, and members is package IR Object
-        #
-        #     # if it is external, give symbol external modifier
-        #     if pkg.is_external:
-        #         sym = Symbol(pkg.name, [], types.DataType(types.DataTypes.PACKAGE, []), [Modifiers.EXTERNAL], pkg.content)
-        #     else:
-        #         sym = Symbol(pkg.name, [], types.DataType(types.DataTypes.PACKAGE, []), [], pkg.content)
-        #     self.scope.append(sym)
-        pass
+        exports = pkg.content.symbol_table.exports
+        consumed = self.consumed.setdefault(id(pkg.content), (pkg.content, set()))[1]
+        # if the package is used, add its exports directly to the current scope
+        # they are only indexed (not added to the scope's items) so they are not exported again
+        if pkg.used:
+            self.scope.symbols.update(exports)
+            for name in exports:
+                self.imported[name] = (exports[name], consumed)
+        else:
+            package = Package(pkg.name, pkg.content.symbol_table, pkg.content.action_tree, pkg.is_external)
+            package.consumed = consumed
+            self.scope.items.append(package)
+            self.scope.symbols[pkg.name] = package
 
     # find symbol in table
     def look_up(self, var):
-        # list that holds all visible layers
-        layers = list()
-        # holds the current layer being appended to layers
-        c_layer = self.table
-        # follow scope path to get all viable layers
-        for item in self.scope_path:
-            layers.append(c_layer)
-            # updated c_layer
-            c_layer = c_layer[item]
-        # add current scope to layers (not added before)
-        layers.append(self.scope)
-        # iterate through layers INWARDS to OUTWARDS (allow for shadowing)
-        for layer in reversed(layers):
-            for item in layer:
-                # handle non packages
-                if isinstance(item, Symbol):
-                    if item.compare(var) and Modifiers.DELETED not in item.modifiers:
-                        # if the symbols are relatively equal, return Symbol
-                        return item
-                # handle packages
-                elif isinstance(item, Package):
-                    if item.name == var:
-                        return item
+        # iterate through visible scopes INWARDS to OUTWARDS (allow for shadowing)
+        scope = self.scope
+        while scope:
+            # deleted symbols are not in the name index
+            if var in scope.symbols:
+                sym = scope.symbols[var]
+                # note the symbols used from used packages (unless they are shadowed)
+                if var in self.imported and self.imported[var][0] is sym:
+                    self.imported[var][1].add(var)
+                return sym
+            scope = scope.parent
         # return nothing if unable to match
 
-    # delete a symbol (give it the delete modifier)
+    # delete a visible symbol (give it the delete modifier)
     def delete(self, var):
-        deleted = False
-
-        def delete(layer):
-            nonlocal deleted
-            for i in range(len(layer)):
-                if isinstance(layer[i], list):
-                    layer[i] = delete(layer[i])
-            # if it has not been caught in previous layers
-            if not deleted:
-                for i in range(len(layer)):
-                    if isinstance(layer[i], Symbol) and layer[i].compare(var):
-                        layer[i].modifiers.append(Modifiers.DELETED)
-                        deleted = True
-                        return layer
-            return layer
-        # attempt to delete symbol
-        self.table = delete(self.table)
+        # iterate through visible scopes INWARDS to OUTWARDS (same symbol look_up would find)
+        scope = self.scope
+        while scope:
+            if var in scope.symbols:
+                # packages can not be deleted
+                if not isinstance(scope.symbols[var], Symbol):
+                    return False
+                # move the symbol out of the name index
+                sym = scope.symbols.pop(var)
+                scope.deleted[var] = sym
+                # symbols of used packages are shared with every other importer (and the package's interface)
+                # so only the local tombstone is recorded for them
+                if var not in self.imported or self.imported[var][0] is not sym:
+                    sym.modifiers.append(Modifiers.DELETED)
+                return True
+            scope = scope.parent
         # return false if unable to delete
-        return deleted
-
-    # remove external modifiers from imported symbol table
-    def remove_externals(self, table):
-        # iterate through upper table
-        for i in range(len(table)):
-            # temporary constant to store table item
-            item = table[i]
-            # if it is a symbol, remove from the table if it is not external
-            if isinstance(item, Symbol):
-                if Modifiers.EXTERNAL not in item.modifiers:
-                    table.pop(i)
-                # if it is external, remove the external modifier so it is external to other import layers
-                else:
-                    table[i].modifiers.pop(table[i].modifiers.index(Modifiers.EXTERNAL))
-            else:
-                # if there are sub tables, bring the externals in those to the surface
-                table[i:i] = self.raise_externals(table[i])
-        return table
-
-    # get all external symbols from non surface layers
-    def raise_externals(self, sub_scope):
-        # temporary list to hold all externals being brought up from lower layers
-        externals = []
-        for item in sub_scope:
-            # if item is symbol, add the symbol with the external modifier removed to externals
-            if isinstance(item, Symbol):
-                if Modifiers.EXTERNAL in item.modifiers:
-                    item.modifiers.pop(item.modifiers.index(Modifiers.EXTERNAL))
-                    externals.append(item)
-            else:
-                # recur and extend externals
-                externals += self.raise_externals(item)
-        # return temporary list back as externals set
-        return externals
+        return False
 
+    # build the export index of the table (all external symbols and packages, including those of sub scopes)
+    # called once the table is complete so importing the table does not have to search it
+    def build_exports(self):
+        self.exports = {}
+        # walk the scopes in declaration order (earlier declarations take priority)
+        scopes = [iter(self.table.items)]
+        while scopes:
+            item = next(scopes[-1], None)
+            if item is None:
+                scopes.pop()
+            elif isinstance(item, Scope):
+                scopes.append(iter(item.items))
+            elif isinstance(item, Symbol):
+                # deleted symbols are not exported
+                if Modifiers.EXTERNAL in item.modifiers and Modifiers.DELETED not in item.modifiers and item.name not in self.exports:
+                    self.exports[item.name] = item
+            elif item.external and item.name not in self.exports:
+                self.exports[item.name] = item
+        return self.exports
@@ -1,4 +1,5 @@
 from enum import Enum
+from copy import copy
 from syc.icg.table import Package
 
 
@@ -43,11 +44,24 @@ class DataType:
 
     # equality operator override
     def __eq__(self, other):
+        if self is other:
+            return True
         if isinstance(other, DataType):
             if other.data_type == self.data_type and other.pointers == self.pointers:
                 return True
         return False
 
+    def __hash__(self):
+        return hash((self.data_type, self.pointers))
+
+    # stored types are interned again when they are loaded
+    def __reduce__(self):
+        return data_type, (self.data_type, self.pointers)
+
+    # copies are modified by their users, so they are never the interned type (see fresh_copy)
+    def __copy__(self):
+        return fresh_copy(self)
+
 
 # adapted data type class for arrays
 class ArrayType:
@@ -59,6 +73,23 @@ class ArrayType:
         # pointers
         self.pointers = pointers
 
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if not isinstance(other, ArrayType):
+            return False
+        return other.element_type == self.element_type and other.count == self.count and other.pointers == self.pointers
+
+    def __hash__(self):
+        return hash((self.element_type, self.count, self.pointers))
+
+    def __reduce__(self):
+        return array_type, (self.element_type, self.count, self.pointers)
+
+    # copies are modified by their users, so they are never the interned type (see fresh_copy)
+    def __copy__(self):
+        return fresh_copy(self)
+
 
 # adapted data type class for lists
 class ListType:
@@ -68,6 +99,23 @@ class ListType:
         # pointers not to the underlying array, but to the list itself
         self.pointers = pointers
 
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if not isinstance(other, ListType):
+            return False
+        return other.element_type == self.element_type and other.pointers == self.pointers
+
+    def __hash__(self):
+        return hash((self.element_type, self.pointers))
+
+    def __reduce__(self):
+        return list_type, (self.element_type, self.pointers)
+
+    # copies are modified by their users, so they are never the interned type (see fresh_copy)
+    def __copy__(self):
+        return fresh_copy(self)
+
 
 # adapted data type class for dicts
 class MapType:
@@ -77,6 +125,23 @@ class MapType:
         # same principal as lists
         self.pointers = pointers
 
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if not isinstance(other, MapType):
+            return False
+        return other.key_type == self.key_type and other.value_type == self.value_type and other.pointers == self.pointers
+
+    def __hash__(self):
+        return hash((self.key_type, self.value_type, self.pointers))
+
+    def __reduce__(self):
+        return map_type, (self.key_type, self.value_type, self.pointers)
+
+    # copies are modified by their users, so they are never the interned type (see fresh_copy)
+    def __copy__(self):
+        return fresh_copy(self)
+
 
 # special data type class for functions
 class Function:
@@ -93,10 +158,22 @@ class Function:
         self.parameters = parameters
 
     def __eq__(self, other):
+        if self is other:
+            return True
         if not isinstance(other, Function):
             return False
         return other.return_type == self.return_type and other.pointers == self.pointers and other.async == self.async and other.parameters == self.parameters
 
+    def __hash__(self):
+        return hash((hashable(self.return_type), self.pointers, self.async, hashable(self.parameters)))
+
+    def __reduce__(self):
+        return function, (self.parameters, self.return_type, self.pointers, self.async, self.generator)
+
+    # copies are modified by their users, so they are never the interned type (see fresh_copy)
+    def __copy__(self):
+        return fresh_copy(self)
+
 
 # class to hold all user defined group types
 class CustomType:
@@ -169,6 +246,8 @@ class Template:
         # initialize type template (type)
         if template_type == self.TemplateTypes.TYPE:
             self.type_list = kwargs['type_list']
+            # types are hashable, so membership tests do not have to compare against the whole list
+            self.type_set = set(self.type_list) if self.type_list else None
         # initialize function template (func, async, lambda)
         elif template_type == self.TemplateTypes.FUNC:
             self.parameters = kwargs['parameters']
@@ -187,7 +266,7 @@ class Template:
             if not self.type_list:
                 return True
             # check by normal type list
-            if other not in self.type_list:
+            if other not in self.type_set:
                 return False
         # if it is a function template, check if it fulfills all function requirements
         elif self.template_type == self.TemplateTypes.FUNC:
@@ -239,6 +318,89 @@ class Generator:
     def __init__(self, dt):
         self.data_type = dt
 
+#################
+# TYPE INTERNING #
+#################
+
+# canonical type objects by structural key
+# types built through the functions below are shared, so structurally equal types are the same object
+# NOTE interned types must never be modified (use pointer to get a type with a different pointer count)
+interned = {}
+
+
+# copy a type without interning it (the interned types reduce to their factories, so copy would return them)
+def fresh_copy(dt):
+    new_dt = dt.__class__.__new__(dt.__class__)
+    new_dt.__dict__.update(dt.__dict__)
+    return new_dt
+
+
+# convert lists (multiple return types, parameters) to tuples so they can be used in keys
+def hashable(value):
+    if isinstance(value, list):
+        return tuple(hashable(x) for x in value)
+    return value
+
+
+# get the canonical simple data type
+def data_type(dt, pointers=0):
+    key = (DataType, dt, pointers)
+    if key not in interned:
+        interned[key] = DataType(dt, pointers)
+    return interned[key]
+
+
+# get the canonical array type
+def array_type(et, count, pointers=0):
+    key = (ArrayType, et, count, pointers)
+    if key not in interned:
+        interned[key] = ArrayType(et, count, pointers)
+    return interned[key]
+
+
+# get the canonical list type
+def list_type(et, pointers=0):
+    key = (ListType, et, pointers)
+    if key not in interned:
+        interned[key] = ListType(et, pointers)
+    return interned[key]
+
+
+# get the canonical map type
+def map_type(kt, vt, pointers=0):
+    key = (MapType, kt, vt, pointers)
+    if key not in interned:
+        interned[key] = MapType(kt, vt, pointers)
+    return interned[key]
+
+
+# get the canonical function type
+def function(parameters, rt, pointers, is_async, is_generator, is_lambda=False):
+    # generator is part of the key (but not equality) so generators are never merged with normal functions
+    key = (Function, hashable(parameters), hashable(rt), pointers, is_async, is_generator)
+    if key not in interned:
+        interned[key] = Function(parameters, rt, pointers, is_async, is_generator, is_lambda)
+    return interned[key]
+
+
+# get a type with count more pointers (negative to dereference)
+def pointer(dt, count=1):
+    if isinstance(dt, DataType):
+        return data_type(dt.data_type, dt.pointers + count)
+    elif isinstance(dt, ArrayType):
+        return array_type(dt.element_type, dt.count, dt.pointers + count)
+    elif isinstance(dt, ListType):
+        return list_type(dt.element_type, dt.pointers + count)
+    elif isinstance(dt, MapType):
+        return map_type(dt.key_type, dt.value_type, dt.pointers + count)
+    elif isinstance(dt, Function):
+        return function(dt.parameters, dt.return_type, dt.pointers + count, dt.async, dt.generator)
+    # other types are not interned (custom types, literals, ect.) so they are copied
+    new_dt = copy(dt)
+    new_dt.pointers += count
+    return new_dt
+
+
 #####################
 # UTILITY FUNCTIONS #
 #####################
@@ -1,13 +1,44 @@
 import sys
-from build import build
 import util
 
+# commands only import the parts of the compiler they use (startup time dominates short builds)
+
+
+# build command (builds given --daemon are forwarded to a running daemon if there is one)
+def build(args):
+    if '--daemon' in args:
+        import daemon
+        args = [x for x in args if x != '--daemon']
+        status = daemon.forward(args)
+        if status is not None:
+            if status:
+                sys.exit(status)
+            return
+        # no daemon is listening, build in this process instead
+        args = daemon.get_socket_path(args)[1]
+    # the client does not load the compiler
+    from build import build as run_build
+    run_build(args)
+
+
+def serve(args):
+    import daemon
+    daemon.serve(args)
+
+
+def bench(args):
+    from bench.suite import bench as run_bench
+    run_bench(args)
+
+
 # dictionary of all possible commands and their respective functions
 # functions take a list of str arguments
 commands = {
     'get': '',
     'rm': '',
     'build': build,
+    'serve': serve,
+    'bench': bench,
     'version': lambda _: print(util.VERSION)
 }
 
@@ -1,5 +1,6 @@
 import os
 import sys
+from collections import OrderedDict
 
 # used for unparse
 from syc.ast.ast import Token
@@ -14,6 +15,9 @@ class SyCloneRecoverableError(Exception):
 # used for opening files such as grammars and tokens
 SOURCE_DIR = os.path.dirname(os.path.realpath(__file__))
 
+# where the compiler stores generated caches (parse table, ect.)
+CACHE_DIR = SOURCE_DIR + '/.sycache'
+
 # current compiler version
 VERSION = '1.0.0'
 
@@ -25,6 +29,36 @@ PLATFORM = sys.platform
 build_file = ''
 
 
+# write a file in the cache directory (caching is only an optimization, so failures are ignored)
+def write_cache(path, data):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # write to a temporary file first so other builds never see a partial file
+        temp_path = '%s.%d' % (path, os.getpid())
+        with open(temp_path, 'wb' if isinstance(data, bytes) else 'w') as file:
+            file.write(data)
+        os.replace(temp_path, path)
+    except OSError:
+        pass
+
+
+# dictionary holding at most size items (the least recently used item is dropped first)
+class LRUCache(OrderedDict):
+    def __init__(self, size):
+        super().__init__()
+        self.size = size
+
+    def __getitem__(self, key):
+        self.move_to_end(key)
+        return super().__getitem__(key)
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        if len(self) > self.size:
+            self.popitem(last=False)
+
+
 # main package class
 class Package:
     def __init__(self, name, extern, used, ast):